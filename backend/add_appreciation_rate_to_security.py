@@ -1,6 +1,7 @@
 """
 Migration script to add assumed_appreciation_rate column to Security table.
-Run this once to update the existing database schema.
+Run this once to update the existing database schema
+(or apply all migrations with `python -m backend.migrations.runner`).
 """
 import sqlite3
 import os
@@ -10,14 +11,8 @@ backend_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(backend_dir)
 db_file = os.path.join(project_root, "retirement_lab_v3.db")
 
-if not os.path.exists(db_file):
-    print(f"Database file not found: {db_file}")
-    exit(1)
-
-conn = sqlite3.connect(db_file)
-cursor = conn.cursor()
-
-try:
+def migrate(conn):
+    cursor = conn.cursor()
     # Check if column already exists
     cursor.execute("PRAGMA table_info(security)")
     columns = [row[1] for row in cursor.fetchall()]
@@ -31,13 +26,27 @@ try:
         print("Added assumed_appreciation_rate column")
     else:
         print("assumed_appreciation_rate column already exists")
-    
-    conn.commit()
-    print("\nMigration completed successfully!")
-    
-except sqlite3.Error as e:
-    print(f"Error: {e}")
-    conn.rollback()
-finally:
-    conn.close()
+
+if __name__ == "__main__":
+    if not os.path.exists(db_file):
+        print(f"Database file not found: {db_file}")
+        exit(1)
+
+    conn = sqlite3.connect(db_file)
+    # WAL lets the running app keep reading while we migrate; busy_timeout makes
+    # SQLite wait for the write lock instead of failing with SQLITE_BUSY.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+    try:
+        migrate(conn)
+        conn.commit()
+        print("\nMigration completed successfully!")
+        
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
 
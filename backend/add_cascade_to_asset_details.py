@@ -0,0 +1,96 @@
+"""
+Migration script to add ON DELETE CASCADE to the asset detail tables' foreign keys.
+SQLite can't alter a foreign key in place, so each table is rebuilt following the
+documented procedure (create new, copy rows, drop old, rename, recreate indexes).
+Run this once to update the existing database schema
+(or apply all migrations with `python -m backend.migrations.runner`).
+"""
+import sqlite3
+import os
+import re
+
+# Get the project root directory
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(backend_dir)
+db_file = os.path.join(project_root, "retirement_lab_v3.db")
+
+# (table, parent table) pairs whose foreign key to the parent should cascade on delete
+CASCADE_TABLES = [
+    ("realestatedetails", "asset"),
+    ("generalequitydetails", "asset"),
+    ("specificstockdetails", "asset"),
+    ("rsugrantdetails", "asset"),
+    ("cashdetails", "asset"),
+    ("rsuvestingtranche", "rsugrantdetails"),
+]
+
+def add_cascade(conn, cascade_tables):
+    """
+    Rebuild each (table, parent) so its foreign key to parent has ON DELETE CASCADE.
+    Expects foreign key enforcement to be off (it can't be toggled inside a transaction).
+    """
+    cursor = conn.cursor()
+    for table, parent in cascade_tables:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,))
+        row = cursor.fetchone()
+        if row is None:
+            print(f"{table} table not found, skipping")
+            continue
+
+        create_sql = row[0]
+        fk_pattern = re.compile(rf"(REFERENCES\s+\"?{parent}\"?\s*\(\s*\"?id\"?\s*\))(?!\s+ON DELETE)", re.IGNORECASE)
+        if not fk_pattern.search(create_sql):
+            print(f"{table} already cascades on delete (or has no FK to {parent})")
+            continue
+
+        print(f"Rebuilding {table} with ON DELETE CASCADE...")
+
+        # Indexes are dropped with the old table, so remember them first
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL", (table,))
+        index_sqls = [r[0] for r in cursor.fetchall()]
+
+        new_sql = fk_pattern.sub(r"\1 ON DELETE CASCADE", create_sql)
+        new_sql = re.sub(rf"^CREATE TABLE\s+\"?{table}\"?", f"CREATE TABLE {table}_new", new_sql, count=1, flags=re.IGNORECASE)
+
+        cursor.execute(new_sql)
+        cursor.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        for index_sql in index_sqls:
+            cursor.execute(index_sql)
+
+        print(f"Rebuilt {table}")
+
+    cursor.execute("PRAGMA foreign_key_check")
+    violations = cursor.fetchall()
+    if violations:
+        print(f"Warning: {len(violations)} existing rows reference missing parents (left as-is)")
+
+def migrate(conn):
+    add_cascade(conn, CASCADE_TABLES)
+
+if __name__ == "__main__":
+    if not os.path.exists(db_file):
+        print(f"Database file not found: {db_file}")
+        exit(1)
+
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    # Foreign key enforcement must be off while tables are dropped and renamed
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        migrate(conn)
+        conn.commit()
+        print("\nMigration completed successfully!")
+
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.close()
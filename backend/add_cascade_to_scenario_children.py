@@ -0,0 +1,59 @@
+"""
+Migration script to add ON DELETE CASCADE to the foreign keys from a scenario's child
+tables (assets, income sources, RSU forecasts, tax settings and tables) to scenario,
+so deleting a scenario row removes everything under it.
+Uses the same table rebuild as add_cascade_to_asset_details.py.
+Run this once to update the existing database schema
+(or apply all migrations with `python -m backend.migrations.runner`).
+"""
+import sqlite3
+import os
+
+try:
+    from .add_cascade_to_asset_details import add_cascade
+except ImportError:
+    # Run directly as a script
+    from add_cascade_to_asset_details import add_cascade
+
+# Get the project root directory
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(backend_dir)
+db_file = os.path.join(project_root, "retirement_lab_v3.db")
+
+# (table, parent table) pairs whose foreign key to the parent should cascade on delete
+CASCADE_TABLES = [
+    ("asset", "scenario"),
+    ("incomesource", "scenario"),
+    ("rsugrantforecast", "scenario"),
+    ("taxfundingsettings", "scenario"),
+    ("taxtable", "scenario"),
+]
+
+def migrate(conn):
+    add_cascade(conn, CASCADE_TABLES)
+
+if __name__ == "__main__":
+    if not os.path.exists(db_file):
+        print(f"Database file not found: {db_file}")
+        exit(1)
+
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    # Foreign key enforcement must be off while tables are dropped and renamed
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        migrate(conn)
+        conn.commit()
+        print("\nMigration completed successfully!")
+
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.close()
@@ -0,0 +1,61 @@
+"""
+Migration script to add indexes on the foreign key columns used to load and delete
+a scenario's rows (asset.scenario_id, incomesource.scenario_id, ...).
+The detail tables' asset_id columns are UNIQUE, so SQLite already indexes them.
+Index names match what SQLModel generates for Field(index=True), so new databases
+created by init_db() end up with the same schema.
+Run this once to update the existing database schema
+(or apply all migrations with `python -m backend.migrations.runner`).
+"""
+import sqlite3
+import os
+
+# Get the project root directory
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(backend_dir)
+db_file = os.path.join(project_root, "retirement_lab_v3.db")
+
+# (table, column) pairs to index
+INDEXES = [
+    ("asset", "scenario_id"),
+    ("incomesource", "scenario_id"),
+    ("rsugrantforecast", "scenario_id"),
+    ("taxtable", "scenario_id"),
+    ("rsuvestingtranche", "rsu_grant_id"),
+]
+
+def migrate(conn):
+    cursor = conn.cursor()
+    for table, column in INDEXES:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,))
+        if cursor.fetchone() is None:
+            print(f"{table} table not found, skipping")
+            continue
+
+        index_name = f"ix_{table}_{column}"
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})")
+        print(f"Ensured index {index_name}")
+
+    # Refresh planner statistics so the new indexes get used
+    cursor.execute("ANALYZE")
+
+if __name__ == "__main__":
+    if not os.path.exists(db_file):
+        print(f"Database file not found: {db_file}")
+        exit(1)
+
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+    try:
+        migrate(conn)
+        conn.commit()
+        print("\nMigration completed successfully!")
+
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
@@ -1,9 +1,37 @@
-from typing import Optional
-from sqlmodel import Session, select, delete
-from sqlalchemy.orm import Query
-from .models import Scenario, Asset, RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, IncomeSource, TaxWrapper, IncomeType, Security, RSUGrantDetails, RSUVestingTranche, RSUGrantForecast, CashDetails
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Optional, List
+from sqlmodel import Session, select, delete, update, func, or_
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Query, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from .models import utcnow, Scenario, Asset, RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, IncomeSource, TaxWrapper, IncomeType, Security, RSUGrantDetails, RSUVestingTranche, RSUGrantForecast, CashDetails, TaxFundingSettings, TaxTable
 from .schemas import ScenarioCreate, AssetCreate, RealEstateDetailsCreate, GeneralEquityDetailsCreate, SpecificStockDetailsCreate, IncomeSourceCreate
-from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Lowercased account_type -> tax wrapper; anything not listed is treated as TAXABLE
+_ACCOUNT_TYPE_TAX_WRAPPERS = {
+    "roth": TaxWrapper.ROTH,
+    "roth ira": TaxWrapper.ROTH,
+    "roth 401k": TaxWrapper.ROTH,
+    "ira": TaxWrapper.TRADITIONAL,
+    "traditional ira": TaxWrapper.TRADITIONAL,
+    "401k": TaxWrapper.TRADITIONAL,
+    "401(k)": TaxWrapper.TRADITIONAL,
+    "403b": TaxWrapper.TRADITIONAL,
+    "457": TaxWrapper.TRADITIONAL,
+    "traditional": TaxWrapper.TRADITIONAL,
+    "taxable": TaxWrapper.TAXABLE,
+    "brokerage": TaxWrapper.TAXABLE,
+    "individual": TaxWrapper.TAXABLE,
+}
+
+# Lowercased income_type value -> IncomeType; unknown values fall back to ORDINARY
+_INCOME_TYPES = {income_type.value.lower(): income_type for income_type in IncomeType}
 
 def infer_tax_wrapper_from_account_type(account_type: str, current_tax_wrapper: TaxWrapper = TaxWrapper.TAXABLE) -> TaxWrapper:
     """
@@ -15,398 +43,523 @@ def infer_tax_wrapper_from_account_type(account_type: str, current_tax_wrapper:
     if current_tax_wrapper != TaxWrapper.TAXABLE:
         return current_tax_wrapper
     
-    account_type_lower = account_type.lower() if account_type else ""
-    
-    if account_type_lower in ("roth", "roth ira", "roth 401k"):
-        return TaxWrapper.ROTH
-    elif account_type_lower in ("ira", "traditional ira", "401k", "401(k)", "403b", "457", "traditional"):
-        return TaxWrapper.TRADITIONAL
-    elif account_type_lower in ("taxable", "brokerage", "individual"):
-        return TaxWrapper.TAXABLE
-    else:
-        # Default to TAXABLE if unknown
-        return TaxWrapper.TAXABLE
+    # Default to TAXABLE if unknown
+    return _ACCOUNT_TYPE_TAX_WRAPPERS.get((account_type or "").lower(), TaxWrapper.TAXABLE)
+
+# Sentinel for "attribute not present" in change detection
+_MISSING = object()
+
+# Rows fetched per round when streaming list queries with yield_per
+STREAM_CHUNK_SIZE = 256
+
+# Serialized asset lists per scenario (what GET /api/scenarios/{id}/assets returns, with its ETag),
+# least recently used first. The cache lives in this process, so the app runs with a single worker.
+# Every write path that changes a scenario's assets (including import and duplicate, which may
+# reuse a deleted scenario's id) calls invalidate_asset_list after committing.
+ASSET_LIST_CACHE_SIZE = 256
+_asset_list_cache = OrderedDict()
+_asset_list_cache_lock = threading.Lock()
+# Bumped on every invalidation, so a list read before a concurrent write committed is never cached
+_asset_list_generation = 0
+
+def get_cached_asset_list(scenario_id: int):
+    """
+    Look up a scenario's serialized asset list. Returns (entry, generation): entry is the (etag, asset_list)
+    pair, or None on a miss, and generation is what to hand back to cache_asset_list once the list has been built.
+    """
+    with _asset_list_cache_lock:
+        entry = _asset_list_cache.get(scenario_id)
+        if entry is not None:
+            _asset_list_cache.move_to_end(scenario_id)
+        return entry, _asset_list_generation
+
+def cache_asset_list(scenario_id: int, entry: tuple, generation: int):
+    """Store an (etag, asset_list) entry, unless an invalidation happened since it started loading at `generation`."""
+    with _asset_list_cache_lock:
+        if generation != _asset_list_generation:
+            return
+        _asset_list_cache[scenario_id] = entry
+        _asset_list_cache.move_to_end(scenario_id)
+        if len(_asset_list_cache) > ASSET_LIST_CACHE_SIZE:
+            _asset_list_cache.popitem(last=False)
+
+def invalidate_asset_list(scenario_id: int):
+    global _asset_list_generation
+    with _asset_list_cache_lock:
+        _asset_list_generation += 1
+        _asset_list_cache.pop(scenario_id, None)
+
+def _after_commit(session: Session, invalidate, *args):
+    """
+    Run a cache invalidation once the caller commits the session's current transaction; for
+    commit=False writes, so a concurrent read can't re-cache the old rows before the commit lands.
+    """
+    event.listen(session, "after_commit", lambda _session: invalidate(*args), once=True)
+
+# Every security, serialized (SecurityRead) and indexed by id and symbol: the table is small, read by
+# every stock/RSU form, and only written through get_or_create_security, which invalidates it.
+_securities_cache = None
+_securities_cache_lock = threading.Lock()
+# Bumped on every invalidation, so securities read before a concurrent write committed are never cached
+_securities_generation = 0
+
+def get_cached_securities():
+    """
+    Look up the cached securities index. Returns (index, generation): index is a dict with "all",
+    "by_id" and "by_symbol" entries, or None on a miss; pass generation back to cache_securities.
+    """
+    with _securities_cache_lock:
+        return _securities_cache, _securities_generation
+
+def cache_securities(securities: list, generation: int) -> dict:
+    """Index serialized securities and store them, unless an invalidation happened since `generation`."""
+    global _securities_cache
+    index = {
+        "all": securities,
+        "by_id": {security.id: security for security in securities},
+        "by_symbol": {security.symbol: security for security in securities},
+    }
+    with _securities_cache_lock:
+        if generation == _securities_generation:
+            _securities_cache = index
+    return index
+
+def invalidate_securities():
+    global _securities_cache, _securities_generation
+    with _securities_cache_lock:
+        _securities_generation += 1
+        _securities_cache = None
 
 def get_scenarios(session: Session):
+    """Stream all scenarios; ORM objects are built STREAM_CHUNK_SIZE rows at a time instead of all at once."""
     statement = select(Scenario)
-    return session.exec(statement).all()
+    yield from session.exec(statement).yield_per(STREAM_CHUNK_SIZE)
+
+def get_scenarios_with_counts(session: Session):
+    """
+    All scenarios with their asset and income source counts, as (Scenario, asset_count, income_source_count) rows.
+    Counts are correlated subqueries rather than joins so the two child tables don't multiply each other.
+    Rows are streamed in STREAM_CHUNK_SIZE chunks; wrap in list() if you need to iterate twice.
+    """
+    asset_count = (
+        select(func.count(Asset.id))
+        .where(Asset.scenario_id == Scenario.id)
+        .correlate(Scenario)
+        .scalar_subquery()
+    )
+    income_source_count = (
+        select(func.count(IncomeSource.id))
+        .where(IncomeSource.scenario_id == Scenario.id)
+        .correlate(Scenario)
+        .scalar_subquery()
+    )
+    statement = select(Scenario, asset_count.label("asset_count"), income_source_count.label("income_source_count"))
+    yield from session.exec(statement).yield_per(STREAM_CHUNK_SIZE)
+
+def get_scenarios_summary(session: Session):
+    """
+    Stream the scenario list columns as (id, name, current_age, retirement_age, created_at) rows.
+    Selects only those columns, so no Scenario objects are built.
+    """
+    statement = select(Scenario.id, Scenario.name, Scenario.current_age, Scenario.retirement_age, Scenario.created_at)
+    yield from session.exec(statement).yield_per(STREAM_CHUNK_SIZE)
 
 def get_scenario(session: Session, scenario_id: int):
     return session.get(Scenario, scenario_id)
 
-def create_scenario(session: Session, scenario_create: ScenarioCreate):
-    db_scenario = Scenario.from_orm(scenario_create)
+def scenario_exists(session: Session, scenario_id: int) -> bool:
+    """Existence check for routes that only need a 404: reads the primary key index, builds no Scenario."""
+    return session.exec(select(1).where(Scenario.id == scenario_id)).first() is not None
+
+# Write helpers take commit=True; pass commit=False to compose several of them in one
+# transaction and commit once in the caller (rows are flushed, so new ids are available).
+
+def create_scenario(session: Session, scenario_create: ScenarioCreate, commit: bool = True):
+    db_scenario = Scenario.model_validate(scenario_create, from_attributes=True)
     # If base_year is not provided, default to current year
     if db_scenario.base_year is None:
-        db_scenario.base_year = datetime.utcnow().year
-    db_scenario.created_at = datetime.utcnow()
-    db_scenario.updated_at = datetime.utcnow()
+        db_scenario.base_year = utcnow().year
     session.add(db_scenario)
-    session.commit()
-    session.refresh(db_scenario)
+    if commit:
+        session.commit()
+    else:
+        session.flush()
     return db_scenario
 
-def update_scenario(session: Session, scenario_id: int, scenario_update: ScenarioCreate):
-    db_scenario = session.get(Scenario, scenario_id)
+def _update_row(session: Session, model, row_id: int, values: dict):
+    """
+    Update one row with a single UPDATE ... RETURNING instead of per-attribute setattr + flush.
+    Returns the updated object, or None if the row doesn't exist.
+    """
+    columns = model.__table__.c
+    # Like setattr on the model, ignore request fields the table doesn't have
+    values = {key: value for key, value in values.items() if key in columns and key != "id"}
+    if not values:
+        return session.get(model, row_id)
+    statement = update(model).where(model.id == row_id).values(**values).returning(model)
+    return session.exec(statement).scalar_one_or_none()
+
+def update_scenario(session: Session, scenario_id: int, scenario_update: ScenarioCreate, commit: bool = True):
+    scenario_data = scenario_update.model_dump(exclude_unset=True)
+    # updated_at is stamped by the column's onupdate in the same statement
+    db_scenario = _update_row(session, Scenario, scenario_id, scenario_data)
     if not db_scenario:
         return None
-    scenario_data = scenario_update.dict(exclude_unset=True)
-    for key, value in scenario_data.items():
-        setattr(db_scenario, key, value)
-    db_scenario.updated_at = datetime.utcnow()
-    session.add(db_scenario)
-    session.commit()
-    session.refresh(db_scenario)
+    if commit:
+        session.commit()
     return db_scenario
 
 def delete_scenario(session: Session, scenario_id: int):
     try:
-        scenario = session.get(Scenario, scenario_id)
-        if not scenario:
-            print(f"DEBUG: Scenario {scenario_id} not found in DB")
+        # Assets (with their details and RSU tranches), income sources, RSU forecasts and
+        # tax settings/tables all go with the scenario row via ON DELETE CASCADE
+        logger.debug("Deleting scenario %s", scenario_id)
+        # The session holds none of the deleted rows, so skip scanning the identity map for them
+        result = session.exec(
+            delete(Scenario).where(Scenario.id == scenario_id).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            logger.debug("Scenario %s not found in DB", scenario_id)
+            session.rollback()
             return None
-        
-        print(f"DEBUG: Found scenario {scenario_id}, deleting assets...")
-        
-        # Get all asset IDs for this scenario
-        asset_ids = session.exec(select(Asset.id).where(Asset.scenario_id == scenario_id)).all()
-        
-        if asset_ids:
-            # Bulk delete details
-            session.exec(delete(RealEstateDetails).where(RealEstateDetails.asset_id.in_(asset_ids)))
-            session.exec(delete(GeneralEquityDetails).where(GeneralEquityDetails.asset_id.in_(asset_ids)))
-            session.exec(delete(SpecificStockDetails).where(SpecificStockDetails.asset_id.in_(asset_ids)))
-            
-            # Bulk delete assets
-            session.exec(delete(Asset).where(Asset.scenario_id == scenario_id))
-            
-        # Bulk delete income sources
-        session.exec(delete(IncomeSource).where(IncomeSource.scenario_id == scenario_id))
-
-        print(f"DEBUG: Deleting scenario object")
-        session.delete(scenario)
         session.commit()
-        print(f"DEBUG: Commit successful")
-        return scenario
+        invalidate_asset_list(scenario_id)
+        logger.debug("Commit successful")
+        return True
     except Exception as e:
-        print(f"DEBUG: Exception in delete_scenario: {e}")
+        logger.error("Exception in delete_scenario: %s", e)
         session.rollback()
         raise e
 
-def create_typed_asset(session: Session, scenario_id: int, asset_data: AssetCreate) -> Asset:
-    try:
-        # Determine type
-        asset_type = asset_data.type
-        
-        # ... (logic)
-        
-        # Initialize current_balance based on type and details
-        current_balance = 0.0
-        if asset_type == "cash":
-            # Cash assets use current_balance directly from AssetCreate
-            assert asset_data.current_balance is not None, "Cash balance required for cash assets"
-            current_balance = asset_data.current_balance
-        elif asset_type == "real_estate":
-            assert asset_data.real_estate_details is not None, "Real estate details required"
-            current_balance = asset_data.real_estate_details.property_value
-        elif asset_type == "general_equity":
-            assert asset_data.general_equity_details is not None, "General equity details required"
-            current_balance = asset_data.general_equity_details.account_balance
-        elif asset_type == "specific_stock":
-            assert asset_data.specific_stock_details is not None, "Specific stock details required"
-            current_balance = asset_data.specific_stock_details.shares_owned * asset_data.specific_stock_details.current_price
-        elif asset_type == "rsu_grant":
-            assert asset_data.rsu_grant_details is not None, "RSU grant details required"
-            # For RSU grants, use the grant_value as the current balance (represents unvested value at grant date)
-            current_balance = asset_data.rsu_grant_details.grant_value
+def _apply_tax_wrapper_inference(ge_data: dict) -> dict:
+    """
+    Infer tax_wrapper from account_type if it wasn't sent or is still at the TAXABLE default.
+    This handles cases where frontend only sends account_type (e.g., "roth", "ira").
+    """
+    if ge_data.get("tax_wrapper", TaxWrapper.TAXABLE) == TaxWrapper.TAXABLE:
+        ge_data["tax_wrapper"] = infer_tax_wrapper_from_account_type(ge_data.get("account_type", "taxable"))
+    return ge_data
+
+def _general_equity_data(details) -> dict:
+    return _apply_tax_wrapper_inference(details.model_dump(exclude_unset=False))
+
+def _rsu_grant_data(details) -> dict:
+    rsu_data = details.model_dump(exclude_unset=False)
+    
+    # Validate vesting tranches sum to 100% (fsum: exactly rounded, so many small tranches don't drift)
+    total_percentage = math.fsum(t.get("percentage_of_grant", 0.0) for t in rsu_data.get("vesting_tranches", []))
+    if abs(total_percentage - 1.0) > 0.001:
+        raise ValueError(f"Vesting tranches must sum to 100%, got {total_percentage * 100}%")
+    
+    # Calculate shares_granted if not provided
+    if not rsu_data.get("shares_granted"):
+        grant_fmv = rsu_data.get("grant_fmv_at_grant", 0)
+        if grant_fmv > 0:
+            rsu_data["shares_granted"] = rsu_data["grant_value"] / grant_fmv
         else:
-            current_balance = 0.0
+            raise ValueError("grant_fmv_at_grant must be provided to calculate shares_granted")
+    return rsu_data
 
-        asset = Asset(
-            scenario_id=scenario_id,
-            name=asset_data.name,
-            type=asset_type,
-            current_balance=current_balance,
-        )
-        session.add(asset)
-        session.flush()  # ensure asset.id is populated
-
-        if asset_type == "real_estate" and asset_data.real_estate_details:
-            re_details = RealEstateDetails(
-                asset_id=asset.id,
-                **asset_data.real_estate_details.dict(exclude_unset=False)
-            )
-            session.add(re_details)
-        elif asset_type == "general_equity" and asset_data.general_equity_details:
-            # Use model_dump() for Pydantic v2, fallback to dict() for v1
-            try:
-                ge_data = asset_data.general_equity_details.model_dump(exclude_unset=False)
-            except AttributeError:
-                ge_data = asset_data.general_equity_details.dict(exclude_unset=False)
-            
-            # Infer tax_wrapper from account_type if not explicitly set or still at default
-            # This handles cases where frontend only sends account_type (e.g., "roth", "ira")
-            if "tax_wrapper" not in ge_data:
-                # tax_wrapper not provided - infer from account_type
-                account_type = ge_data.get("account_type", "taxable")
-                ge_data["tax_wrapper"] = infer_tax_wrapper_from_account_type(account_type, TaxWrapper.TAXABLE)
-            elif ge_data.get("tax_wrapper") == TaxWrapper.TAXABLE and "account_type" in ge_data:
-                # tax_wrapper is default TAXABLE but account_type suggests otherwise - infer from account_type
-                account_type = ge_data.get("account_type", "taxable")
-                inferred = infer_tax_wrapper_from_account_type(account_type, TaxWrapper.TAXABLE)
-                if inferred != TaxWrapper.TAXABLE:
-                    ge_data["tax_wrapper"] = inferred
-            
-            ge_details = GeneralEquityDetails(
-                asset_id=asset.id,
-                **ge_data
-            )
-            session.add(ge_details)
-        elif asset_type == "specific_stock" and asset_data.specific_stock_details:
-            stock_details = SpecificStockDetails(
-                asset_id=asset.id,
-                **asset_data.specific_stock_details.dict()
-            )
-            session.add(stock_details)
-        elif asset_type == "rsu_grant" and asset_data.rsu_grant_details:
-            rsu_data = asset_data.rsu_grant_details.dict(exclude_unset=False)
-            vesting_tranches_data = rsu_data.pop("vesting_tranches", [])
-            
-            # Validate vesting tranches sum to 100%
-            total_percentage = sum(t.get("percentage_of_grant", 0) for t in vesting_tranches_data)
-            if abs(total_percentage - 1.0) > 0.001:
-                raise ValueError(f"Vesting tranches must sum to 100%, got {total_percentage * 100}%")
-            
-            # Calculate shares_granted if not provided
-            if "shares_granted" not in rsu_data or rsu_data["shares_granted"] == 0:
-                if rsu_data.get("grant_fmv_at_grant", 0) > 0:
-                    rsu_data["shares_granted"] = rsu_data["grant_value"] / rsu_data["grant_fmv_at_grant"]
-                else:
-                    raise ValueError("grant_fmv_at_grant must be provided to calculate shares_granted")
-            
-            rsu_grant = RSUGrantDetails(
-                asset_id=asset.id,
-                **rsu_data
-            )
-            session.add(rsu_grant)
-            session.flush()  # Ensure rsu_grant.id is populated
-            
-            # Create vesting tranches
-            for tranche_data in vesting_tranches_data:
-                tranche = RSUVestingTranche(
-                    grant_id=rsu_grant.id,
-                    **tranche_data
-                )
-                session.add(tranche)
+# asset type -> (details model, Asset/AssetCreate attribute, current_balance from details, details -> column dict)
+ASSET_HANDLERS = {
+    "real_estate": (RealEstateDetails, "real_estate_details", lambda d: d.property_value, lambda d: d.model_dump(exclude_unset=False)),
+    "general_equity": (GeneralEquityDetails, "general_equity_details", lambda d: d.account_balance, _general_equity_data),
+    "specific_stock": (SpecificStockDetails, "specific_stock_details", lambda d: d.shares_owned * d.current_price, lambda d: d.model_dump()),
+    # For RSU grants, use the grant_value as the current balance (represents unvested value at grant date)
+    "rsu_grant": (RSUGrantDetails, "rsu_grant_details", lambda d: d.grant_value, _rsu_grant_data),
+}
 
+# Every one-to-one details relationship on Asset
+DETAIL_ATTRS = [handler[1] for handler in ASSET_HANDLERS.values()] + ["cash_details"]
+
+# asset type -> details models to remove when an asset is switched to that type
+STALE_DETAIL_MODELS = {
+    asset_type: [(handler[0], handler[1]) for other_type, handler in ASSET_HANDLERS.items() if other_type != asset_type]
+    for asset_type in ["cash", *ASSET_HANDLERS]
+}
+
+def _build_details(details_model, details_data: dict):
+    """Build a details row from its column dict; RSU vesting tranches are attached to the grant."""
+    vesting_tranches_data = details_data.pop("vesting_tranches", None)
+    details = details_model(**details_data)
+    if vesting_tranches_data is not None:
+        details.vesting_tranches = [
+            RSUVestingTranche(**tranche_data) for tranche_data in vesting_tranches_data
+        ]
+    return details
+
+def _build_asset_and_details(scenario_id: int, asset_data: AssetCreate):
+    """
+    Build an unsaved Asset plus its type's details as (asset, relationship attr, details model, column dict);
+    the last three are None for cash. No session I/O.
+    """
+    asset_type = asset_data.type
+    handler = ASSET_HANDLERS.get(asset_type)
+    
+    # Initialize current_balance based on type and details
+    details_model = attr = details_data = None
+    if asset_type == "cash":
+        # Cash assets use current_balance directly from AssetCreate
+        assert asset_data.current_balance is not None, "Cash balance required for cash assets"
+        current_balance = asset_data.current_balance
+    elif handler:
+        details_model, attr, balance_fn, data_fn = handler
+        details = getattr(asset_data, attr)
+        assert details is not None, f"{attr} required for {asset_type} assets"
+        current_balance = balance_fn(details)
+        details_data = data_fn(details)
+    else:
+        current_balance = 0.0
+
+    asset = Asset(
+        scenario_id=scenario_id,
+        name=asset_data.name,
+        type=asset_type,
+        current_balance=current_balance,
+    )
+    return asset, attr, details_model, details_data
+
+def _build_typed_asset(scenario_id: int, asset_data: AssetCreate) -> Asset:
+    """Build an unsaved Asset with its type-specific details attached (no session I/O)."""
+    asset, attr, details_model, details_data = _build_asset_and_details(scenario_id, asset_data)
+
+    # Details are attached through the relationship so the unit of work inserts
+    # the asset and its details in one flush, with asset_id filled in for us.
+    if details_data is not None:
+        setattr(asset, attr, _build_details(details_model, details_data))
+
+    # A new asset has no other detail rows; record that so reading them later doesn't lazy-load
+    for other_attr in DETAIL_ATTRS:
+        if other_attr != attr:
+            set_committed_value(asset, other_attr, None)
+
+    return asset
+
+def create_typed_asset(session: Session, scenario_id: int, asset_data: AssetCreate) -> Asset:
+    try:
+        asset = _build_typed_asset(scenario_id, asset_data)
+        session.add(asset)
         session.commit()
-        session.refresh(asset)
+        invalidate_asset_list(scenario_id)
         return asset
     except Exception as e:
-        print(f"DEBUG: Exception in create_typed_asset: {e}")
+        logger.error("Exception in create_typed_asset: %s", e)
+        session.rollback()
+        raise e
+
+def create_typed_assets_bulk(session: Session, scenario_id: int, assets_data: List[AssetCreate]) -> List[Asset]:
+    """
+    Create many assets (with their details) for a scenario in a single transaction.
+    Assets go out in one flush (multi-row INSERTs with RETURNING for the new ids); detail rows
+    are then inserted with one Core executemany per table, skipping ORM state tracking.
+    Those details aren't attached to the returned assets and load lazily on access.
+    """
+    try:
+        assets = []
+        core_details = []  # (asset, details model, column dict) inserted with Core once the asset has an id
+        for asset_data in assets_data:
+            asset, attr, details_model, details_data = _build_asset_and_details(scenario_id, asset_data)
+            if details_model is RSUGrantDetails:
+                # Grants own their vesting tranches, so they go through the unit of work
+                setattr(asset, attr, _build_details(details_model, details_data))
+            elif details_data is not None:
+                core_details.append((asset, details_model, details_data))
+            assets.append(asset)
+        session.add_all(assets)
+        session.flush()
+
+        # The column dicts become the insert rows directly; the table's column defaults
+        # fill the rest (timestamps etc.), so no throwaway model instance is built per row
+        rows_by_model = {}
+        for asset, details_model, details_data in core_details:
+            columns = details_model.__table__.c
+            row = {key: value for key, value in details_data.items() if key in columns and key != "id"}
+            row["asset_id"] = asset.id
+            rows_by_model.setdefault(details_model, []).append(row)
+        for details_model, rows in rows_by_model.items():
+            session.execute(details_model.__table__.insert(), rows)
+
+        session.commit()
+        invalidate_asset_list(scenario_id)
+        return assets
+    except Exception as e:
+        logger.error("Exception in create_typed_assets_bulk: %s", e)
         session.rollback()
         raise e
 
+def _apply_changes(obj, values: dict) -> bool:
+    """Set only the attributes whose value differs; returns True if anything changed."""
+    changed = False
+    for key, value in values.items():
+        if getattr(obj, key, _MISSING) != value:
+            setattr(obj, key, value)
+            changed = True
+    return changed
+
+def _tranches_match(db_tranches, vesting_tranches_data) -> bool:
+    if len(db_tranches) != len(vesting_tranches_data):
+        return False
+    return all(
+        getattr(db_tranche, key, _MISSING) == value
+        for db_tranche, tranche_data in zip(db_tranches, vesting_tranches_data)
+        for key, value in tranche_data.items()
+    )
+
+def _upsert_details(session: Session, details_model, asset_id: int, details_data: dict) -> bool:
+    """
+    Insert or update an asset's details row in one statement (INSERT ... ON CONFLICT(asset_id) DO UPDATE).
+    The update only fires when some value differs, so no-op saves write nothing.
+    Returns True if a row was written.
+    """
+    columns = details_model.__table__.c
+    # Like the model constructor, ignore request fields the table doesn't have
+    details_data = {key: value for key, value in details_data.items() if key in columns}
+    # Build the full row through the model so model-side defaults (timestamps etc.) apply on insert
+    row = details_model(asset_id=asset_id, **details_data).model_dump(exclude={"id"})
+    statement = sqlite_insert(details_model).values(**row)
+    statement = statement.on_conflict_do_update(
+        index_elements=["asset_id"],
+        set_={**{key: statement.excluded[key] for key in details_data}, "updated_at": statement.excluded.updated_at},
+        where=or_(*(columns[key].is_distinct_from(statement.excluded[key]) for key in details_data)),
+    )
+    return session.exec(statement).rowcount > 0
+
+def _details_match(db_details, details_model, details_data: dict) -> bool:
+    """True if an existing details row already holds every column value in details_data."""
+    if db_details is None:
+        return False
+    columns = details_model.__table__.c
+    return all(
+        getattr(db_details, key, _MISSING) == value
+        for key, value in details_data.items()
+        if key in columns
+    )
+
+def _expire_details(session: Session, db_asset: Asset, attrs: List[str]):
+    """Core statements bypass the identity map, so forget any detail rows this session already loaded."""
+    if not attrs:
+        # session.expire() treats an empty attribute list as "everything", which would drop pending changes
+        return
+    loaded = inspect(db_asset).dict
+    for attr in attrs:
+        if loaded.get(attr) is not None:
+            session.expire(loaded[attr])
+    session.expire(db_asset, attrs)
+
+def _clear_sibling_details(session: Session, asset_id: int, keep_type: str) -> bool:
+    """
+    Delete an asset's details rows for every type other than keep_type (RSU tranches cascade in the DB).
+    Returns True if any row was deleted. Callers must expire the matching relationships (see _expire_details).
+    """
+    deleted = False
+    for stale_model, _ in STALE_DETAIL_MODELS.get(keep_type, []):
+        result = session.exec(
+            delete(stale_model).where(stale_model.asset_id == asset_id).execution_options(synchronize_session=False)
+        )
+        deleted |= result.rowcount > 0
+    return deleted
+
 def update_typed_asset(session: Session, asset_id: int, asset_data: AssetCreate) -> Asset:
     db_asset = session.get(Asset, asset_id)
     if not db_asset:
         return None
     
-    # Update base fields
-    db_asset.name = asset_data.name
-    db_asset.type = asset_data.type
+    type_changed = db_asset.type != asset_data.type
+    # Only touch attributes that actually change, so no-op saves (the form re-saves
+    # unchanged assets) issue no UPDATEs
+    changed = _apply_changes(db_asset, {"name": asset_data.name, "type": asset_data.type})
+    handler = ASSET_HANDLERS.get(db_asset.type)
+    # Detail relationships written with Core statements rather than through the ORM
+    core_attrs = []
     
     # Update current_balance and nested details
     if db_asset.type == "cash":
         # Cash assets - just update balance
         if asset_data.current_balance is not None:
-            db_asset.current_balance = asset_data.current_balance
-        
-        # Remove other type details if they exist (e.g. if type changed)
-        if db_asset.real_estate_details:
-            session.delete(db_asset.real_estate_details)
-        if db_asset.general_equity_details:
-            session.delete(db_asset.general_equity_details)
-        if db_asset.specific_stock_details:
-            session.delete(db_asset.specific_stock_details)
-        if db_asset.rsu_grant_details:
-            session.delete(db_asset.rsu_grant_details)
-            
-    elif db_asset.type == "real_estate":
-        if not asset_data.real_estate_details:
+            changed |= _apply_changes(db_asset, {"current_balance": asset_data.current_balance})
+    elif handler:
+        details_model, attr, balance_fn, data_fn = handler
+        details = getattr(asset_data, attr)
+        if not details:
             return None # validation error in real app
         
-        # Update balance
-        db_asset.current_balance = asset_data.real_estate_details.property_value
-        
-        # Update or create details
-        if db_asset.real_estate_details:
-            # Use dict(exclude_unset=False) to include all fields, even if None
-            for key, value in asset_data.real_estate_details.dict(exclude_unset=False).items():
-                setattr(db_asset.real_estate_details, key, value)
-            session.add(db_asset.real_estate_details)
-        else:
-            re_details = RealEstateDetails(
-                asset_id=db_asset.id,
-                **asset_data.real_estate_details.dict(exclude_unset=False)
-            )
-            session.add(re_details)
-            
-        # Remove other type details if they exist (e.g. if type changed)
-        if db_asset.general_equity_details:
-            session.delete(db_asset.general_equity_details)
-            
-    elif db_asset.type == "general_equity":
-        if not asset_data.general_equity_details:
-            return None
-            
-        db_asset.current_balance = asset_data.general_equity_details.account_balance
-        
-        ge_data = asset_data.general_equity_details.dict()
-        # Infer tax_wrapper from account_type if not explicitly set or still at default
-        # This handles cases where frontend only sends account_type (e.g., "roth", "ira")
-        if "tax_wrapper" not in ge_data:
-            # tax_wrapper not provided - infer from account_type
-            account_type = ge_data.get("account_type", "taxable")
-            ge_data["tax_wrapper"] = infer_tax_wrapper_from_account_type(account_type, TaxWrapper.TAXABLE)
-        elif ge_data.get("tax_wrapper") == TaxWrapper.TAXABLE and "account_type" in ge_data:
-            # tax_wrapper is default TAXABLE but account_type suggests otherwise - infer from account_type
-            account_type = ge_data.get("account_type", "taxable")
-            inferred = infer_tax_wrapper_from_account_type(account_type, TaxWrapper.TAXABLE)
-            if inferred != TaxWrapper.TAXABLE:
-                ge_data["tax_wrapper"] = inferred
-        
-        if db_asset.general_equity_details:
-            for key, value in ge_data.items():
-                setattr(db_asset.general_equity_details, key, value)
-            session.add(db_asset.general_equity_details)
-        else:
-            ge_details = GeneralEquityDetails(
-                asset_id=db_asset.id,
-                **ge_data
-            )
-            session.add(ge_details)
-            
-        if db_asset.real_estate_details:
-            session.delete(db_asset.real_estate_details)
-        if db_asset.specific_stock_details:
-            session.delete(db_asset.specific_stock_details)
-
-    elif db_asset.type == "specific_stock":
-        if not asset_data.specific_stock_details:
-            return None
-        
-        db_asset.current_balance = asset_data.specific_stock_details.shares_owned * asset_data.specific_stock_details.current_price
+        changed |= _apply_changes(db_asset, {"current_balance": balance_fn(details)})
+        details_data = data_fn(details)
         
-        if db_asset.specific_stock_details:
-            for key, value in asset_data.specific_stock_details.dict().items():
-                setattr(db_asset.specific_stock_details, key, value)
-            session.add(db_asset.specific_stock_details)
-        else:
-            stock_details = SpecificStockDetails(
-                asset_id=db_asset.id,
-                **asset_data.specific_stock_details.dict()
-            )
-            session.add(stock_details)
-            
-        if db_asset.real_estate_details:
-            session.delete(db_asset.real_estate_details)
-        if db_asset.general_equity_details:
-            session.delete(db_asset.general_equity_details)
-        if db_asset.rsu_grant_details:
-            session.delete(db_asset.rsu_grant_details)
-
-    elif db_asset.type == "rsu_grant":
-        if not asset_data.rsu_grant_details:
-            return None
-        
-        # For RSU grants, update balance based on current unvested value
-        db_asset.current_balance = asset_data.rsu_grant_details.grant_value
-        
-        rsu_data = asset_data.rsu_grant_details.dict(exclude_unset=False)
-        vesting_tranches_data = rsu_data.pop("vesting_tranches", [])
-        
-        # Validate vesting tranches sum to 100%
-        total_percentage = sum(t.get("percentage_of_grant", 0) for t in vesting_tranches_data)
-        if abs(total_percentage - 1.0) > 0.001:
-            raise ValueError(f"Vesting tranches must sum to 100%, got {total_percentage * 100}%")
-        
-        # Calculate shares_granted if not provided
-        if "shares_granted" not in rsu_data or rsu_data["shares_granted"] == 0:
-            if rsu_data.get("grant_fmv_at_grant", 0) > 0:
-                rsu_data["shares_granted"] = rsu_data["grant_value"] / rsu_data["grant_fmv_at_grant"]
+        if details_model is RSUGrantDetails:
+            # Grants own their vesting tranches, so they go through the ORM
+            db_details = db_asset.rsu_grant_details
+            if db_details:
+                vesting_tranches_data = details_data.pop("vesting_tranches", None)
+                changed |= _apply_changes(db_details, details_data)
+                if vesting_tranches_data is not None and not _tranches_match(db_details.vesting_tranches, vesting_tranches_data):
+                    # Replace existing tranches: one bulk DELETE, then one Core executemany INSERT
+                    old_tranches = list(db_details.vesting_tranches)
+                    session.exec(
+                        delete(RSUVestingTranche)
+                        .where(RSUVestingTranche.rsu_grant_id == db_details.id)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if vesting_tranches_data:
+                        now = utcnow()
+                        session.execute(
+                            RSUVestingTranche.__table__.insert(),
+                            [
+                                {**tranche_data, "rsu_grant_id": db_details.id, "created_at": now, "updated_at": now}
+                                for tranche_data in vesting_tranches_data
+                            ],
+                        )
+                    # The old rows are gone; drop them (and the stale collection) from the session
+                    session.expire(db_details, ["vesting_tranches"])
+                    for tranche in old_tranches:
+                        session.expunge(tranche)
+                    changed = True
             else:
-                raise ValueError("grant_fmv_at_grant must be provided to calculate shares_granted")
-        
-        if db_asset.rsu_grant_details:
-            # Update existing grant
-            for key, value in rsu_data.items():
-                setattr(db_asset.rsu_grant_details, key, value)
-            session.add(db_asset.rsu_grant_details)
-            
-            # Delete existing tranches and recreate
-            existing_tranches = session.exec(
-                select(RSUVestingTranche).where(RSUVestingTranche.rsu_grant_id == db_asset.rsu_grant_details.id)
-            ).all()
-            for tranche in existing_tranches:
-                session.delete(tranche)
-            
-            # Create new tranches
-            for tranche_data in vesting_tranches_data:
-                tranche = RSUVestingTranche(
-                    grant_id=db_asset.rsu_grant_details.id,
-                    **tranche_data
-                )
-                session.add(tranche)
-        else:
-            # Create new grant details
-            rsu_grant = RSUGrantDetails(
-                asset_id=db_asset.id,
-                **rsu_data
-            )
-            session.add(rsu_grant)
-            session.flush()
-            
-            for tranche_data in vesting_tranches_data:
-                tranche = RSUVestingTranche(
-                    grant_id=rsu_grant.id,
-                    **tranche_data
-                )
-                session.add(tranche)
-        
-        # Remove other type details if they exist
-        if db_asset.real_estate_details:
-            session.delete(db_asset.real_estate_details)
-        if db_asset.general_equity_details:
-            session.delete(db_asset.general_equity_details)
-        if db_asset.specific_stock_details:
-            session.delete(db_asset.specific_stock_details)
-            
+                db_asset.rsu_grant_details = _build_details(details_model, details_data)
+                changed = True
+        elif not _details_match(getattr(db_asset, attr), details_model, details_data):
+            # Compare against the stored row first (a plain SELECT), so a no-op save sends no
+            # INSERT ... ON CONFLICT, which would take SQLite's write lock even when it matches nothing
+            changed |= _upsert_details(session, details_model, db_asset.id, details_data)
+            core_attrs.append(attr)
+    
+    # Remove the previous type's details; an asset that kept its type has none to remove
+    if type_changed:
+        changed |= _clear_sibling_details(session, db_asset.id, db_asset.type)
+        core_attrs.extend(stale_attr for _, stale_attr in STALE_DETAIL_MODELS.get(db_asset.type, []))
+    _expire_details(session, db_asset, core_attrs)
+    
+    if not changed:
+        if core_attrs:
+            # A Core statement ran but matched nothing; end its transaction to release the write lock
+            session.commit()
+        # No-op save (the form re-saves unchanged assets): nothing to write, nothing to invalidate
+        return db_asset
+    
     session.add(db_asset)
     session.commit()
-    session.refresh(db_asset)
+    invalidate_asset_list(db_asset.scenario_id)
     return db_asset
 
 def delete_asset(session: Session, asset_id: int, commit: bool = True):
-    # Direct delete without object loading
+    # Direct delete without object loading; detail rows and RSU tranches cascade in the DB
     try:
-        # First, delete vesting tranches if this is an RSU grant
-        rsu_grant = session.exec(
-            select(RSUGrantDetails).where(RSUGrantDetails.asset_id == asset_id)
-        ).first()
-        if rsu_grant:
-            session.exec(delete(RSUVestingTranche).where(RSUVestingTranche.rsu_grant_id == rsu_grant.id))
-            session.exec(delete(RSUGrantDetails).where(RSUGrantDetails.asset_id == asset_id))
-        
-        session.exec(delete(RealEstateDetails).where(RealEstateDetails.asset_id == asset_id))
-        session.exec(delete(GeneralEquityDetails).where(GeneralEquityDetails.asset_id == asset_id))
-        session.exec(delete(SpecificStockDetails).where(SpecificStockDetails.asset_id == asset_id))
-        session.exec(delete(Asset).where(Asset.id == asset_id))
+        # RETURNING tells us which scenario's asset list to invalidate (and whether the asset existed)
+        scenario_id = session.exec(
+            delete(Asset).where(Asset.id == asset_id).returning(Asset.scenario_id).execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if scenario_id is None:
+            if commit:
+                session.rollback()
+            return None
         if commit:
             session.commit()
+            invalidate_asset_list(scenario_id)
+        else:
+            _after_commit(session, invalidate_asset_list, scenario_id)
         return True
     except Exception as e:
-        print(f"DEBUG: Exception in delete_asset: {e}")
+        logger.error("Exception in delete_asset: %s", e)
         if commit:
             session.rollback()
         raise e
@@ -415,71 +568,60 @@ def create_asset(session: Session, asset_create: AssetCreate, scenario_id: int):
     return create_typed_asset(session, scenario_id, asset_create)
 
 def get_assets_for_scenario(session: Session, scenario_id: int):
-    import traceback
-    print(f"[DEBUG] get_assets_for_scenario: Starting for scenario_id={scenario_id}")
+    logger.debug("get_assets_for_scenario: Starting for scenario_id=%s", scenario_id)
     try:
-        statement = select(Asset).where(Asset.scenario_id == scenario_id)
-        print(f"[DEBUG] get_assets_for_scenario: Executing query...")
+        # Eagerly load detail relationships to avoid lazy loading issues during serialization:
+        # one extra SELECT per relationship for all assets, instead of one per asset
+        statement = select(Asset).where(Asset.scenario_id == scenario_id).options(
+            selectinload(Asset.real_estate_details),
+            selectinload(Asset.general_equity_details),
+            selectinload(Asset.specific_stock_details),
+            selectinload(Asset.rsu_grant_details).selectinload(RSUGrantDetails.vesting_tranches),
+            selectinload(Asset.cash_details),
+        )
+        logger.debug("get_assets_for_scenario: Executing query...")
         assets = session.exec(statement).all()
-        print(f"[DEBUG] get_assets_for_scenario: Retrieved {len(assets)} assets from database")
+        logger.debug("get_assets_for_scenario: Retrieved %s assets from database", len(assets))
     except Exception as e:
-        print(f"[ERROR] get_assets_for_scenario: Error querying assets: {e}")
-        traceback.print_exc()
+        logger.exception("get_assets_for_scenario: Error querying assets: %s", e)
         raise
     
-    # Eagerly load detail relationships to avoid lazy loading issues during serialization
-    for idx, asset in enumerate(assets):
-        print(f"[DEBUG] get_assets_for_scenario: Eager loading details for asset {idx+1}/{len(assets)}: id={asset.id}, type={asset.type}")
-        try:
-            if asset.type == "real_estate":
-                print(f"[DEBUG] get_assets_for_scenario: Eager loading RealEstateDetails for asset {asset.id}")
-                _ = session.exec(select(RealEstateDetails).where(RealEstateDetails.asset_id == asset.id)).first()
-            elif asset.type == "general_equity":
-                print(f"[DEBUG] get_assets_for_scenario: Eager loading GeneralEquityDetails for asset {asset.id}")
-                _ = session.exec(select(GeneralEquityDetails).where(GeneralEquityDetails.asset_id == asset.id)).first()
-            elif asset.type == "specific_stock":
-                print(f"[DEBUG] get_assets_for_scenario: Eager loading SpecificStockDetails for asset {asset.id}")
-                _ = session.exec(select(SpecificStockDetails).where(SpecificStockDetails.asset_id == asset.id)).first()
-            elif asset.type == "rsu_grant":
-                print(f"[DEBUG] get_assets_for_scenario: Eager loading RSUGrantDetails for asset {asset.id}")
-                rsu_grant = session.exec(select(RSUGrantDetails).where(RSUGrantDetails.asset_id == asset.id)).first()
-                if rsu_grant:
-                    print(f"[DEBUG] get_assets_for_scenario: Found RSUGrantDetails id={rsu_grant.id}, eager loading tranches...")
-                    # Also load vesting tranches
-                    _ = session.exec(select(RSUVestingTranche).where(RSUVestingTranche.rsu_grant_id == rsu_grant.id)).all()
-            elif asset.type == "cash":
-                print(f"[DEBUG] get_assets_for_scenario: Eager loading CashDetails for asset {asset.id}")
-                _ = session.exec(select(CashDetails).where(CashDetails.asset_id == asset.id)).first()
-        except Exception as e:
-            import traceback
-            print(f"[ERROR] get_assets_for_scenario: Error eager loading details for asset {asset.id} (type: {asset.type}): {e}")
-            traceback.print_exc()
-            raise
-    
-    print(f"[DEBUG] get_assets_for_scenario: Successfully eager loaded all details, returning {len(assets)} assets")
     return assets
 
 # Security CRUD helpers
-def get_or_create_security(session: Session, symbol: str, name: Optional[str] = None, assumed_appreciation_rate: Optional[float] = None) -> Security:
+def get_or_create_security(session: Session, symbol: str, name: Optional[str] = None, assumed_appreciation_rate: Optional[float] = None, commit: bool = True) -> Security:
     """Get existing security by symbol, or create if it doesn't exist. Updates appreciation rate if provided."""
-    existing = session.exec(select(Security).where(Security.symbol == symbol)).first()
-    if existing:
-        # Update appreciation rate if provided
-        if assumed_appreciation_rate is not None:
-            existing.assumed_appreciation_rate = assumed_appreciation_rate
-            session.add(existing)
-            session.commit()
-            session.refresh(existing)
-        return existing
-    
-    security = Security(
-        symbol=symbol, 
+    # One INSERT ... ON CONFLICT(symbol) ... RETURNING, so concurrent callers can't race
+    row = Security(
+        symbol=symbol,
         name=name,
         assumed_appreciation_rate=assumed_appreciation_rate if assumed_appreciation_rate is not None else 0.0
-    )
-    session.add(security)
-    session.commit()
-    session.refresh(security)
+    ).model_dump(exclude={"id"})
+    statement = sqlite_insert(Security).values(**row)
+    if assumed_appreciation_rate is not None:
+        # Only touch the existing row when the rate actually differs
+        statement = statement.on_conflict_do_update(
+            index_elements=["symbol"],
+            set_={"assumed_appreciation_rate": statement.excluded.assumed_appreciation_rate},
+            where=Security.assumed_appreciation_rate != statement.excluded.assumed_appreciation_rate,
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=["symbol"])
+    security = session.exec(
+        statement.returning(Security).execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    # RETURNING yields a row only if one was inserted or updated
+    changed = security is not None
+    if not changed:
+        security = session.exec(
+            select(Security).where(Security.symbol == symbol).execution_options(populate_existing=True)
+        ).one()
+    if commit:
+        session.commit()
+        if changed:
+            invalidate_securities()
+    elif changed:
+        _after_commit(session, invalidate_securities)
     return security
 
 def get_security(session: Session, security_id: int) -> Optional[Security]:
@@ -490,55 +632,75 @@ def get_security_by_symbol(session: Session, symbol: str) -> Optional[Security]:
     """Get security by symbol."""
     return session.exec(select(Security).where(Security.symbol == symbol)).first()
 
-def create_income_source(session: Session, income_source: IncomeSourceCreate, scenario_id: int):
-    source_data = income_source.dict()
+def _income_source_data(income_source: IncomeSourceCreate) -> dict:
+    source_data = income_source.model_dump()
+    # The API calls it amount; the table column is annual_amount
+    source_data["annual_amount"] = source_data.pop("amount")
     # Ensure income_type is properly set (handle string to enum conversion)
     if "income_type" in source_data:
         income_type_val = source_data["income_type"]
         if isinstance(income_type_val, str):
-            try:
-                source_data["income_type"] = IncomeType(income_type_val.lower())
-            except ValueError:
-                source_data["income_type"] = IncomeType.ORDINARY  # Default if invalid
+            source_data["income_type"] = _INCOME_TYPES.get(income_type_val.lower(), IncomeType.ORDINARY)  # Default if invalid
     else:
         source_data["income_type"] = IncomeType.ORDINARY  # Default if not provided
-    
-    db_income_source = IncomeSource(scenario_id=scenario_id, **source_data)
+    return source_data
+
+def create_income_source(session: Session, income_source: IncomeSourceCreate, scenario_id: int, commit: bool = True):
+    db_income_source = IncomeSource(scenario_id=scenario_id, **_income_source_data(income_source))
     session.add(db_income_source)
-    session.commit()
-    session.refresh(db_income_source)
+    if commit:
+        session.commit()
+    else:
+        session.flush()
     return db_income_source
 
+def create_income_sources_bulk(session: Session, scenario_id: int, income_sources: List[IncomeSourceCreate]) -> List[IncomeSource]:
+    """
+    Create many income sources for a scenario in a single transaction.
+    They go out in one flush (multi-row INSERTs with RETURNING for the new ids) and one commit.
+    """
+    try:
+        db_income_sources = [
+            IncomeSource(scenario_id=scenario_id, **_income_source_data(income_source))
+            for income_source in income_sources
+        ]
+        session.add_all(db_income_sources)
+        session.commit()
+        return db_income_sources
+    except Exception as e:
+        logger.error("Exception in create_income_sources_bulk: %s", e)
+        session.rollback()
+        raise e
+
 def get_income_sources_for_scenario(session: Session, scenario_id: int):
     statement = select(IncomeSource).where(IncomeSource.scenario_id == scenario_id)
     return session.exec(statement).all()
 
-def delete_income_source(session: Session, income_source_id: int):
-    income_source = session.get(IncomeSource, income_source_id)
-    if not income_source:
+def delete_income_source(session: Session, income_source_id: int, commit: bool = True):
+    # Direct delete without loading the row; rowcount tells us whether it existed
+    result = session.exec(
+        delete(IncomeSource).where(IncomeSource.id == income_source_id).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        if commit:
+            session.rollback()
         return None
-    session.delete(income_source)
-    session.commit()
-    return income_source
+    if commit:
+        session.commit()
+    return True
 
-def update_income_source(session: Session, income_source_id: int, income_source_update: IncomeSourceCreate):
-    db_income_source = session.get(IncomeSource, income_source_id)
-    if not db_income_source:
-        return None
-    source_data = income_source_update.dict(exclude_unset=True)
+def update_income_source(session: Session, income_source_id: int, income_source_update: IncomeSourceCreate, commit: bool = True):
+    source_data = income_source_update.model_dump(exclude_unset=True)
     
     # Handle income_type conversion if present
     if "income_type" in source_data:
         income_type_val = source_data["income_type"]
         if isinstance(income_type_val, str):
-            try:
-                source_data["income_type"] = IncomeType(income_type_val.lower())
-            except ValueError:
-                source_data["income_type"] = IncomeType.ORDINARY  # Default if invalid
+            source_data["income_type"] = _INCOME_TYPES.get(income_type_val.lower(), IncomeType.ORDINARY)  # Default if invalid
     
-    for key, value in source_data.items():
-        setattr(db_income_source, key, value)
-    session.add(db_income_source)
-    session.commit()
-    session.refresh(db_income_source)
+    db_income_source = _update_row(session, IncomeSource, income_source_id, source_data)
+    if not db_income_source:
+        return None
+    if commit:
+        session.commit()
     return db_income_source
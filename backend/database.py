@@ -1,8 +1,10 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import event
 import os
 
 # Import all models so SQLModel can create tables
 from . import models  # noqa: F401
+from .migrations.runner import migrate_database
 
 # Get the project root directory (one level up from backend/)
 backend_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,13 +13,43 @@ project_root = os.path.dirname(backend_dir)
 sqlite_file_name = os.path.join(project_root, "retirement_lab_v3.db")
 sqlite_url = f"sqlite:///{sqlite_file_name}"
 
-connect_args = {"check_same_thread": False}
-engine = create_engine(sqlite_url, echo=True, connect_args=connect_args)
+# timeout: seconds the driver waits on a locked database before raising "database is locked"
+connect_args = {"check_same_thread": False, "timeout": 30}
+# Statement logging formats every query and its parameters; opt in with SQL_ECHO=1 when debugging
+sql_echo = os.environ.get("SQL_ECHO", "0") == "1"
+engine = create_engine(
+    sqlite_url,
+    echo=sql_echo,
+    connect_args=connect_args,
+    # Sync routes run in FastAPI's threadpool (40 threads), so size the pool to match
+    # rather than making requests queue behind the default 5 + 10 connections
+    pool_size=25,
+    max_overflow=15,
+    pool_use_lifo=True,  # Reuse the most recently returned (warmest) connection
+    pool_pre_ping=True,
+)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Per-connection SQLite setup: WAL so readers don't block the writer, cheaper fsyncs, FK enforcement."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # Read up to 256 MB of the file via mmap, skipping read() copies
+    cursor.execute("PRAGMA foreign_keys=ON")  # Needed for ON DELETE CASCADE on detail tables
+    cursor.close()
 
 def init_db():
+    """Create missing tables, then migrate tables an older version created (FK cascades, indexes, ...)."""
     SQLModel.metadata.create_all(engine)
+    # Deletes rely on ON DELETE CASCADE and the model expects the current columns, so an existing
+    # database must be migrated before the first request; already-applied migrations are skipped
+    migrate_database(sqlite_file_name)
 
 def get_session():
-    with Session(engine) as session:
+    # Keep committed objects loaded so routes can return them without a refresh SELECT;
+    # each request gets its own session, so nothing stale outlives the request.
+    with Session(engine, expire_on_commit=False) as session:
         yield session
-
@@ -1,44 +1,82 @@
 from typing import Dict, Any, List, Optional
-from sqlmodel import Session, select
-from .models import Scenario, Asset, IncomeSource, RealEstateDetails, GeneralEquityDetails, SpecificStockDetails
+from sqlmodel import Session, select, func
+from sqlalchemy import insert, literal
+from sqlalchemy.orm import selectinload
+from .models import (
+    Scenario, Asset, IncomeSource, RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, CashDetails,
+    RSUGrantDetails, RSUVestingTranche, RSUGrantForecast, TaxFundingSettings, TaxFundingOrderEntry, TaxTable,
+)
+from .crud import STREAM_CHUNK_SIZE, invalidate_asset_list
+
+# Ids, foreign keys and timestamps are always assigned fresh on import, so they're left out
+# of the export. The asset id stays: income sources' linked_asset_id is remapped through it.
+_TIMESTAMPS = frozenset({"created_at", "updated_at"})
+_SCENARIO_EXCLUDE = {"id"} | _TIMESTAMPS
+_ASSET_EXCLUDE = {"scenario_id"} | _TIMESTAMPS
+_DETAILS_EXCLUDE = {"id", "asset_id"} | _TIMESTAMPS
+_INCOME_EXCLUDE = {"id", "scenario_id"} | _TIMESTAMPS
+
+# Fields accepted from an import file, computed once; unknown fields are dropped for
+# forward compatibility, as are the excluded ones above (older exports include them)
+_SCENARIO_FIELDS = frozenset(Scenario.model_fields) - _SCENARIO_EXCLUDE
+_ASSET_FIELDS = frozenset(Asset.model_fields) - _ASSET_EXCLUDE - {"id"}
+_RE_FIELDS = frozenset(RealEstateDetails.model_fields) - _DETAILS_EXCLUDE
+_GE_FIELDS = frozenset(GeneralEquityDetails.model_fields) - _DETAILS_EXCLUDE
+_SS_FIELDS = frozenset(SpecificStockDetails.model_fields) - _DETAILS_EXCLUDE
+_INCOME_FIELDS = frozenset(IncomeSource.model_fields) - _INCOME_EXCLUDE
+
+# asset type -> (details model, its importable fields, Asset relationship / export key)
+_DETAIL_DISPATCH = {
+    "real_estate": (RealEstateDetails, _RE_FIELDS, "real_estate_details"),
+    "general_equity": (GeneralEquityDetails, _GE_FIELDS, "general_equity_details"),
+    "specific_stock": (SpecificStockDetails, _SS_FIELDS, "specific_stock_details"),
+}
+
+def _filter_fields(raw: Dict[str, Any], fields: frozenset) -> Dict[str, Any]:
+    return {k: raw[k] for k in fields.intersection(raw)}
 
 def export_scenario(session: Session, scenario_id: int) -> Dict[str, Any]:
     """
-    Export a scenario and all its related data to a dictionary.
+    Export a scenario and all its related data to a dictionary of JSON-ready values.
     """
     scenario = session.get(Scenario, scenario_id)
     if not scenario:
         raise ValueError(f"Scenario with ID {scenario_id} not found")
 
     # 1. Export Scenario Core
-    scenario_data = scenario.dict()
+    scenario_data = scenario.model_dump(mode="json", exclude=_SCENARIO_EXCLUDE)
     
     # 2. Export Assets
-    # We need to fetch assets and their specific details
+    # We need to fetch assets and their specific details; selectinload fetches each detail
+    # table in one extra SELECT for all assets instead of one lazy load per asset
     assets_data = []
-    assets = session.exec(select(Asset).where(Asset.scenario_id == scenario_id)).all()
-    
-    for asset in assets:
-        asset_dict = asset.dict()
+    statement = select(Asset).where(Asset.scenario_id == scenario_id).options(
+        selectinload(Asset.real_estate_details),
+        selectinload(Asset.general_equity_details),
+        selectinload(Asset.specific_stock_details),
+    )
+    # Stream the assets so only one chunk of ORM objects (and their details) is alive at a time
+    for asset in session.exec(statement).yield_per(STREAM_CHUNK_SIZE):
+        asset_dict = asset.model_dump(mode="json", exclude=_ASSET_EXCLUDE)
         
         # Fetch details based on type
         if asset.type == "real_estate":
             if asset.real_estate_details:
-                asset_dict["real_estate_details"] = asset.real_estate_details.dict()
+                asset_dict["real_estate_details"] = asset.real_estate_details.model_dump(mode="json", exclude=_DETAILS_EXCLUDE)
         elif asset.type == "general_equity":
             if asset.general_equity_details:
-                asset_dict["general_equity_details"] = asset.general_equity_details.dict()
+                asset_dict["general_equity_details"] = asset.general_equity_details.model_dump(mode="json", exclude=_DETAILS_EXCLUDE)
         elif asset.type == "specific_stock":
             if asset.specific_stock_details:
-                asset_dict["specific_stock_details"] = asset.specific_stock_details.dict()
+                asset_dict["specific_stock_details"] = asset.specific_stock_details.model_dump(mode="json", exclude=_DETAILS_EXCLUDE)
                 
         assets_data.append(asset_dict)
 
     # 3. Export Income Sources
     income_sources_data = []
-    income_sources = session.exec(select(IncomeSource).where(IncomeSource.scenario_id == scenario_id)).all()
-    for source in income_sources:
-        income_sources_data.append(source.dict())
+    income_sources = session.exec(select(IncomeSource).where(IncomeSource.scenario_id == scenario_id))
+    for source in income_sources.yield_per(STREAM_CHUNK_SIZE):
+        income_sources_data.append(source.model_dump(mode="json", exclude=_INCOME_EXCLUDE))
 
     return {
         "version": "1.0",
@@ -52,34 +90,17 @@ def import_scenario(session: Session, data: Dict[str, Any], new_name: Optional[s
     Import a scenario from a dictionary.
     Returns the ID of the newly created scenario.
     """
-    scenario_data = data.get("scenario", {})
-    
-    # remove ID to ensure new creation
-    if "id" in scenario_data:
-        del scenario_data["id"]
-        
+    # Create Scenario (without its id and timestamps, so it's created fresh with default timestamps)
+    filtered_scenario_data = _filter_fields(data.get("scenario", {}), _SCENARIO_FIELDS)
     if new_name:
-        scenario_data["name"] = new_name
-        
-    # Create Scenario
-    # Filter out unknown fields for forward compatibility
-    valid_scenario_fields = Scenario.__fields__.keys()
-    filtered_scenario_data = {k: v for k, v in scenario_data.items() if k in valid_scenario_fields}
-    
-    # Remove datetime fields so SQLModel can set defaults
-    for ts_field in ("created_at", "updated_at"):
-        filtered_scenario_data.pop(ts_field, None)
+        filtered_scenario_data["name"] = new_name
     
     new_scenario = Scenario(**filtered_scenario_data)
     session.add(new_scenario)
-    session.commit()
-    session.refresh(new_scenario)
-    
-    new_scenario_id = new_scenario.id
     
-    # Track ID mapping for relationships
-    # old_asset_id -> new_asset_id
-    asset_id_map = {}
+    # Assets and their details are attached through relationships, so a single flush
+    # inserts them all (batched per table) with the foreign keys filled in for us
+    imported_assets = []  # (old_asset_id, new Asset)
     
     # Import Assets
     assets_list = data.get("assets", [])
@@ -87,59 +108,34 @@ def import_scenario(session: Session, data: Dict[str, Any], new_name: Optional[s
         old_id = asset_raw.get("id")
         
         # Prepare base asset data
-        valid_asset_fields = Asset.__fields__.keys()
-        filtered_asset_data = {k: v for k, v in asset_raw.items() if k in valid_asset_fields and k != "id"}
-        filtered_asset_data["scenario_id"] = new_scenario_id
+        filtered_asset_data = _filter_fields(asset_raw, _ASSET_FIELDS)
         
         new_asset = Asset(**filtered_asset_data)
-        session.add(new_asset)
-        session.commit()
-        session.refresh(new_asset)
-        
-        if old_id is not None:
-            asset_id_map[old_id] = new_asset.id
+        new_scenario.assets.append(new_asset)
+        imported_assets.append((old_id, new_asset))
             
         # Import Details
-        asset_type = new_asset.type
-        
-        if asset_type == "real_estate" and "real_estate_details" in asset_raw:
-            details_data = asset_raw["real_estate_details"]
-            if details_data:
-                valid_fields = RealEstateDetails.__fields__.keys()
-                filtered_details = {k: v for k, v in details_data.items() if k in valid_fields and k != "id"}
-                filtered_details["asset_id"] = new_asset.id
-                
-                details = RealEstateDetails(**filtered_details)
-                session.add(details)
-                
-        elif asset_type == "general_equity" and "general_equity_details" in asset_raw:
-            details_data = asset_raw["general_equity_details"]
-            if details_data:
-                valid_fields = GeneralEquityDetails.__fields__.keys()
-                filtered_details = {k: v for k, v in details_data.items() if k in valid_fields and k != "id"}
-                filtered_details["asset_id"] = new_asset.id
-                
-                details = GeneralEquityDetails(**filtered_details)
-                session.add(details)
-
-        elif asset_type == "specific_stock" and "specific_stock_details" in asset_raw:
-            details_data = asset_raw["specific_stock_details"]
+        entry = _DETAIL_DISPATCH.get(new_asset.type)
+        if entry:
+            details_model, fields, attr = entry
+            details_data = asset_raw.get(attr)
             if details_data:
-                valid_fields = SpecificStockDetails.__fields__.keys()
-                filtered_details = {k: v for k, v in details_data.items() if k in valid_fields and k != "id"}
-                filtered_details["asset_id"] = new_asset.id
-                
-                details = SpecificStockDetails(**filtered_details)
-                session.add(details)
-        
-        session.commit()
+                setattr(new_asset, attr, details_model(**_filter_fields(details_data, fields)))
+    
+    # One flush assigns the new ids needed to remap linked assets below
+    session.flush()
+    
+    # Track ID mapping for relationships
+    # old_asset_id -> new_asset_id
+    asset_id_map = {old_id: new_asset.id for old_id, new_asset in imported_assets if old_id is not None}
 
     # Import Income Sources
+    # Nothing reads them back, so they go in with one Core executemany instead of the unit of work
+    income_rows = []
     income_list = data.get("income_sources", [])
     for income_raw in income_list:
-        valid_income_fields = IncomeSource.__fields__.keys()
-        filtered_income = {k: v for k, v in income_raw.items() if k in valid_income_fields and k != "id"}
-        filtered_income["scenario_id"] = new_scenario_id
+        filtered_income = _filter_fields(income_raw, _INCOME_FIELDS)
+        filtered_income["scenario_id"] = new_scenario.id
         
         # Fix linked_asset_id
         old_linked_id = filtered_income.get("linked_asset_id")
@@ -150,9 +146,113 @@ def import_scenario(session: Session, data: Dict[str, Any], new_name: Optional[s
                 # Asset not found (maybe wasn't exported or ID mismatch), unlink it to be safe
                 filtered_income["linked_asset_id"] = None
         
-        new_income = IncomeSource(**filtered_income)
-        session.add(new_income)
+        # Build the row through the model so every row has the same keys, with defaults filled in.
+        # Enums arrive as their JSON strings, which the column accepts as is, so skip the
+        # serializer's type warnings for them.
+        income_rows.append(IncomeSource(**filtered_income).model_dump(exclude={"id"}, warnings=False))
+    if income_rows:
+        session.execute(IncomeSource.__table__.insert(), income_rows)
     
+    new_scenario_id = new_scenario.id
     session.commit()
+    # A reused scenario id may still have a list cached from before its previous owner was deleted
+    invalidate_asset_list(new_scenario_id)
     
     return new_scenario_id
+
+def _copy_rows(session: Session, model, fixed: Dict[str, Any], source, returning=None):
+    """
+    INSERT INTO model SELECT ... FROM source: the fixed columns take the given values or
+    expressions, the rest are copied over, and ids and timestamps are left to the defaults.
+    """
+    columns = [c for c in model.__table__.columns if c.key not in fixed and c.key != "id" and c.key not in _TIMESTAMPS]
+    statement = insert(model).from_select([*fixed, *(c.key for c in columns)], source.add_columns(*fixed.values(), *columns))
+    if returning is not None:
+        statement = statement.returning(returning)
+    return session.execute(statement)
+
+def _id_map(session: Session, table, source, name: str):
+    """
+    Map the ids of the rows `source` selects from `table` to the ids their copies will get:
+    current max id + rank by old id. Copies are inserted with these ids explicitly, so child
+    rows can be pointed at them by joining on the mapping.
+    """
+    max_id = session.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar_one()
+    return source.add_columns(
+        table.c.id.label("old_id"),
+        (max_id + func.row_number().over(order_by=table.c.id)).label("new_id"),
+    ).subquery(name)
+
+def duplicate_scenario(session: Session, scenario_id: int, new_name: Optional[str] = None) -> int:
+    """
+    Copy a scenario with everything under it (assets with their details and RSU tranches,
+    income sources, RSU forecasts, tax funding settings and tax tables) inside the database
+    with INSERT ... SELECT; no rows pass through Python.
+    Returns the ID of the new scenario.
+    """
+    scenario, asset = Scenario.__table__, Asset.__table__
+    grant, tranche = RSUGrantDetails.__table__, RSUVestingTranche.__table__
+    settings, order_entry = TaxFundingSettings.__table__, TaxFundingOrderEntry.__table__
+
+    name = literal(new_name) if new_name else scenario.c.name
+    new_scenario_id = _copy_rows(
+        session, Scenario, {"name": name},
+        select().select_from(scenario).where(scenario.c.id == scenario_id),
+        returning=scenario.c.id,
+    ).scalar_one_or_none()
+    if new_scenario_id is None:
+        session.rollback()
+        raise ValueError(f"Scenario with ID {scenario_id} not found")
+
+    # The scenario insert above already holds SQLite's write lock, so the max ids the
+    # mappings are built from can't move underneath us
+    asset_id_map = _id_map(session, asset, select().where(asset.c.scenario_id == scenario_id), "asset_id_map")
+    _copy_rows(
+        session, Asset, {"id": asset_id_map.c.new_id, "scenario_id": literal(new_scenario_id)},
+        select().select_from(asset.join(asset_id_map, asset.c.id == asset_id_map.c.old_id)),
+    )
+    for details_model in (RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, CashDetails):
+        details = details_model.__table__
+        _copy_rows(
+            session, details_model, {"asset_id": asset_id_map.c.new_id},
+            select().select_from(details.join(asset_id_map, details.c.asset_id == asset_id_map.c.old_id)),
+        )
+
+    # RSU grants get mapped ids too, so their vesting tranches can follow them
+    grant_id_map = _id_map(
+        session, grant,
+        select().select_from(grant.join(asset, grant.c.asset_id == asset.c.id)).where(asset.c.scenario_id == scenario_id),
+        "grant_id_map",
+    )
+    _copy_rows(
+        session, RSUGrantDetails, {"id": grant_id_map.c.new_id, "asset_id": asset_id_map.c.new_id},
+        select().select_from(
+            grant.join(grant_id_map, grant.c.id == grant_id_map.c.old_id)
+            .join(asset_id_map, grant.c.asset_id == asset_id_map.c.old_id)
+        ),
+    )
+    _copy_rows(
+        session, RSUVestingTranche, {"rsu_grant_id": grant_id_map.c.new_id},
+        select().select_from(tranche.join(grant_id_map, tranche.c.rsu_grant_id == grant_id_map.c.old_id)),
+    )
+
+    for child_model in (IncomeSource, RSUGrantForecast, TaxTable):
+        child = child_model.__table__
+        _copy_rows(
+            session, child_model, {"scenario_id": literal(new_scenario_id)},
+            select().select_from(child).where(child.c.scenario_id == scenario_id),
+        )
+
+    settings_id_map = _id_map(session, settings, select().where(settings.c.scenario_id == scenario_id), "settings_id_map")
+    _copy_rows(
+        session, TaxFundingSettings, {"id": settings_id_map.c.new_id, "scenario_id": literal(new_scenario_id)},
+        select().select_from(settings.join(settings_id_map, settings.c.id == settings_id_map.c.old_id)),
+    )
+    _copy_rows(
+        session, TaxFundingOrderEntry, {"settings_id": settings_id_map.c.new_id},
+        select().select_from(order_entry.join(settings_id_map, order_entry.c.settings_id == settings_id_map.c.old_id)),
+    )
+
+    session.commit()
+    invalidate_asset_list(new_scenario_id)
+    return new_scenario_id
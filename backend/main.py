@@ -1,22 +1,79 @@
-from fastapi import FastAPI, Depends, HTTPException, Body
+import atexit
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+from contextlib import asynccontextmanager
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session
+from fastapi.responses import Response, StreamingResponse
+from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlalchemy.orm import selectinload
 from typing import List, Dict, Any, Optional
 
-from .database import init_db, get_session
-from .models import Scenario, Asset, Security, RSUGrantForecast, TaxFundingSettings, TaxFundingSource, InsufficientFundsBehavior, TaxTable, TaxTableIndexingPolicy
+from .database import engine, init_db, get_session
+from .models import utcnow, Scenario, Asset, Security, RSUGrantDetails, RSUVestingTranche, SpecificStockDetails, RSUGrantForecast, TaxFundingSettings, TaxFundingOrderEntry, DEFAULT_TAX_FUNDING_ORDER, InsufficientFundsBehavior, TaxTable, TaxTableIndexingPolicy
 from .tax_config import FilingStatus, get_federal_ordinary_tax_table, get_state_tax_table
 # Import all models to ensure they're registered with SQLModel for table creation
 from . import models  # noqa: F401
 from .schemas import (
-    ScenarioCreate, ScenarioRead, AssetCreate, AssetRead, IncomeSourceCreate, IncomeSourceRead,
+    ScenarioCreate, ScenarioRead, ScenarioReadWithCounts, ScenarioSummaryRead, AssetCreate, AssetRead, IncomeSourceCreate, IncomeSourceRead,
     SecurityCreate, SecurityRead, RSUGrantForecastCreate, RSUGrantForecastRead,
-    TaxFundingSettingsCreate, TaxFundingSettingsRead, TaxTableCreate, TaxTableRead
+    TaxFundingSettingsCreate, TaxFundingSettingsRead, TaxTableCreate, TaxTableRead,
+    RealEstateDetailsRead, GeneralEquityDetailsRead, SpecificStockDetailsRead, RSUGrantDetailsRead, RSUVestingTrancheRead, CashDetailsRead
 )
 from . import crud, simulation
-from .export_import import export_scenario, import_scenario
+from .export_import import export_scenario, import_scenario, duplicate_scenario
+
+# Production runs at INFO, so the per-request debug logging below costs one level check.
+# Request threads only enqueue records; a listener thread writes them to stderr, so logging
+# (logger.exception in particular) never blocks a request on console I/O.
+# Set up on app startup rather than at import, so importing the app (tests, tools) starts no thread.
+_log_listener = None
+
+def _start_logging():
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    atexit.register(_stop_logging)  # Drains the queue if the process exits without a shutdown event
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # The queue handler only merges the message arguments; the level/logger prefix is added by the listener
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+def _stop_logging():
+    """Detach the queue handler and stop the listener once it has written everything queued."""
+    global _log_listener
+    if _log_listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is _log_listener.queue:
+            root.removeHandler(handler)
+    _log_listener.stop()
+    _log_listener = None
+    atexit.unregister(_stop_logging)
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _start_logging()
+    init_db()
+    yield
+    _stop_logging()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",
@@ -31,17 +88,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-def on_startup():
-    init_db()
-
+# No I/O here, so run it on the event loop instead of taking a threadpool worker;
+# health probes then answer even while every DB-bound request thread is busy
 @app.get("/api/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
-@app.get("/api/scenarios", response_model=List[ScenarioRead])
-def read_scenarios(session: Session = Depends(get_session)):
-    return crud.get_scenarios(session)
+def _scenario_with_counts(row) -> ScenarioReadWithCounts:
+    scenario, asset_count, income_source_count = row
+    return ScenarioReadWithCounts(**scenario.model_dump(), asset_count=asset_count, income_source_count=income_source_count)
+
+def _stream_scenarios():
+    """
+    Yield the scenario list as a JSON array, one scenario at a time as rows stream in.
+    Uses its own session: the request's session may be closed before the response body is sent.
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        yield "["
+        for idx, row in enumerate(crud.get_scenarios_with_counts(session)):
+            yield ("," if idx else "") + _scenario_with_counts(row).model_dump_json()
+        yield "]"
+
+@app.get("/api/scenarios", response_model=List[ScenarioReadWithCounts])
+def read_scenarios(stream: bool = False, session: Session = Depends(get_session)):
+    # ?stream=true sends scenarios as they are read instead of building the whole list first
+    if stream:
+        return StreamingResponse(_stream_scenarios(), media_type="application/json")
+    return [_scenario_with_counts(row) for row in crud.get_scenarios_with_counts(session)]
+
+# Registered before /api/scenarios/{scenario_id} so "summary" isn't read as an id
+@app.get("/api/scenarios/summary", response_model=List[ScenarioSummaryRead])
+def read_scenarios_summary(session: Session = Depends(get_session)):
+    """Scenario list with only the columns the list view shows."""
+    return [ScenarioSummaryRead(**row._mapping) for row in crud.get_scenarios_summary(session)]
 
 @app.post("/api/scenarios", response_model=ScenarioRead)
 def create_scenario(scenario: ScenarioCreate, session: Session = Depends(get_session)):
@@ -63,26 +142,66 @@ def import_scenario_endpoint(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
+def _row_etag(row) -> str:
+    """
+    Weak ETag over a row's column values. Timestamps only have one-second resolution
+    (CURRENT_TIMESTAMP), so updated_at alone could miss two edits within the same second.
+    """
+    values = tuple(getattr(row, column.key) for column in row.__table__.columns)
+    return f'W/"{hashlib.blake2b(repr(values).encode(), digest_size=16).hexdigest()}"'
+
+def _content_etag(content: bytes) -> str:
+    return f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+def _json_response(request: Request, content: bytes) -> Response:
+    """
+    Response for an already-encoded JSON body, tagged with an ETag over its bytes.
+    A client that already holds this body gets an empty 304 instead.
+    """
+    etag = _content_etag(content)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+@app.post("/api/scenarios/{scenario_id}/duplicate")
+def duplicate_scenario_endpoint(scenario_id: int, new_name: Optional[str] = None, session: Session = Depends(get_session)):
+    """
+    Duplicate a scenario with everything under it (assets and their details, income sources,
+    RSU forecasts, tax settings and tables), copied inside the database.
+    """
+    try:
+        new_id = duplicate_scenario(session, scenario_id, new_name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Duplicate failed: {str(e)}")
+    return {"new_scenario_id": new_id, "status": "duplicated"}
+
 @app.get("/api/scenarios/{scenario_id}", response_model=ScenarioRead)
-def read_scenario(scenario_id: int, session: Session = Depends(get_session)):
+def read_scenario(scenario_id: int, request: Request, response: Response, session: Session = Depends(get_session)):
     try:
         scenario = crud.get_scenario(session, scenario_id)
-        if not scenario:
-            raise HTTPException(status_code=404, detail="Scenario not found")
-        return scenario
     except Exception as e:
-        import traceback
-        print(f"Error reading scenario: {e}")
-        print(traceback.format_exc())
+        logger.exception("Error reading scenario: %s", e)
         raise HTTPException(status_code=500, detail=f"Error reading scenario: {str(e)}")
+    if not scenario:
+        raise HTTPException(status_code=404, detail="Scenario not found")
+    # The client's copy is current: skip response validation and serialization
+    etag = _row_etag(scenario)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return scenario
 
 @app.get("/api/scenarios/{scenario_id}/export")
-def export_scenario_endpoint(scenario_id: int, session: Session = Depends(get_session)):
+def export_scenario_endpoint(scenario_id: int, request: Request, session: Session = Depends(get_session)):
     """
     Export a scenario and all related data to a JSON-compatible format.
     """
     try:
-        return export_scenario(session, scenario_id)
+        # The export is already JSON-ready, so encode it in one orjson pass
+        # instead of FastAPI's jsonable_encoder walk plus stdlib json
+        return _json_response(request, orjson.dumps(export_scenario(session, scenario_id)))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -98,48 +217,45 @@ def update_scenario(scenario_id: int, scenario: ScenarioCreate, session: Session
 
 @app.delete("/api/scenarios/{scenario_id}")
 def delete_scenario(scenario_id: int, session: Session = Depends(get_session)):
-    print(f"DEBUG: Received delete request for scenario {scenario_id}")
+    logger.debug("Received delete request for scenario %s", scenario_id)
     try:
         deleted_scenario = crud.delete_scenario(session, scenario_id)
-        if not deleted_scenario:
-            print(f"DEBUG: Scenario {scenario_id} not found or delete failed")
-            raise HTTPException(status_code=404, detail="Scenario not found")
-        print(f"DEBUG: Scenario {scenario_id} deleted successfully")
-        return {"status": "deleted", "id": scenario_id}
     except Exception as e:
-        print(f"DEBUG: Error deleting scenario: {e}")
+        logger.exception("Error deleting scenario: %s", e)
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
+    if not deleted_scenario:
+        logger.debug("Scenario %s not found", scenario_id)
+        raise HTTPException(status_code=404, detail="Scenario not found")
+    logger.debug("Scenario %s deleted successfully", scenario_id)
+    return {"status": "deleted", "id": scenario_id}
 
 # Tax Funding Settings endpoints
 @app.get("/api/scenarios/{scenario_id}/settings", response_model=TaxFundingSettingsRead)
 def get_tax_funding_settings(scenario_id: int, session: Session = Depends(get_session)):
     """Get tax funding settings for a scenario. Creates default if not exists."""
     # Check if scenario exists
-    scenario = session.get(Scenario, scenario_id)
-    if not scenario:
+    if not crud.scenario_exists(session, scenario_id):
         raise HTTPException(status_code=404, detail="Scenario not found")
     
     # Get or create settings
-    from sqlmodel import select
-    settings = session.exec(select(TaxFundingSettings).where(TaxFundingSettings.scenario_id == scenario_id)).first()
+    settings = session.exec(
+        select(TaxFundingSettings)
+        .where(TaxFundingSettings.scenario_id == scenario_id)
+        .options(selectinload(TaxFundingSettings.order_entries))
+    ).first()
     if not settings:
         # Create default settings
-        import json
-        default_order = [TaxFundingSource.CASH, TaxFundingSource.TAXABLE_BROKERAGE, 
-                        TaxFundingSource.TRADITIONAL_RETIREMENT, TaxFundingSource.ROTH]
         settings = TaxFundingSettings(
             scenario_id=scenario_id,
-            tax_funding_order_json=json.dumps([s.value for s in default_order]),
             allow_retirement_withdrawals_for_taxes=True,
-            if_insufficient_funds_behavior=InsufficientFundsBehavior.FAIL_WITH_SHORTFALL
+            if_insufficient_funds_behavior=InsufficientFundsBehavior.FAIL_WITH_SHORTFALL,
+            order_entries=[TaxFundingOrderEntry(position=i, source=source) for i, source in enumerate(DEFAULT_TAX_FUNDING_ORDER)]
         )
         session.add(settings)
         session.commit()
-        session.refresh(settings)
     
-    # Parse JSON and return
-    import json
-    tax_funding_order = [TaxFundingSource(s) for s in json.loads(settings.tax_funding_order_json)]
+    # order_entries is loaded in position order
+    tax_funding_order = [entry.source for entry in settings.order_entries]
     return TaxFundingSettingsRead(
         id=settings.id,
         scenario_id=settings.scenario_id,
@@ -158,30 +274,11 @@ def update_tax_funding_settings(
 ):
     """Update tax funding settings for a scenario."""
     # Check if scenario exists
-    scenario = session.get(Scenario, scenario_id)
-    if not scenario:
+    if not crud.scenario_exists(session, scenario_id):
         raise HTTPException(status_code=404, detail="Scenario not found")
     
-    # Validate tax_funding_order
-    if not settings_data.tax_funding_order:
-        raise HTTPException(status_code=400, detail="tax_funding_order must contain at least one source")
-    
-    # Check for duplicates
-    if len(settings_data.tax_funding_order) != len(set(settings_data.tax_funding_order)):
-        raise HTTPException(status_code=400, detail="tax_funding_order contains duplicate entries")
-    
-    # Validate all are known enums
-    valid_sources = {TaxFundingSource.CASH, TaxFundingSource.TAXABLE_BROKERAGE, 
-                     TaxFundingSource.TRADITIONAL_RETIREMENT, TaxFundingSource.ROTH}
-    for source in settings_data.tax_funding_order:
-        if source not in valid_sources:
-            raise HTTPException(status_code=400, detail=f"Unknown tax funding source: {source}")
-    
     # Get or create settings
-    from sqlmodel import select
     settings = session.exec(select(TaxFundingSettings).where(TaxFundingSettings.scenario_id == scenario_id)).first()
-    import json
-    from datetime import datetime
     
     # Validate indexing policy
     if settings_data.tax_table_indexing_policy == TaxTableIndexingPolicy.CUSTOM_RATE:
@@ -195,33 +292,42 @@ def update_tax_funding_settings(
     
     if settings:
         # Update existing
-        settings.tax_funding_order_json = json.dumps([s.value for s in settings_data.tax_funding_order])
         settings.allow_retirement_withdrawals_for_taxes = settings_data.allow_retirement_withdrawals_for_taxes
         settings.if_insufficient_funds_behavior = settings_data.if_insufficient_funds_behavior
         settings.tax_table_indexing_policy = settings_data.tax_table_indexing_policy
         settings.tax_table_custom_index_rate = settings_data.tax_table_custom_index_rate
-        settings.updated_at = datetime.utcnow()
+        settings.updated_at = utcnow()
+        # Replace the order wholesale: clear the old positions, then insert the new ones
+        session.execute(delete(TaxFundingOrderEntry).where(TaxFundingOrderEntry.settings_id == settings.id))
+        session.execute(
+            TaxFundingOrderEntry.__table__.insert(),
+            [
+                {"settings_id": settings.id, "position": i, "source": source}
+                for i, source in enumerate(settings_data.tax_funding_order)
+            ],
+        )
     else:
         # Create new
         settings = TaxFundingSettings(
             scenario_id=scenario_id,
-            tax_funding_order_json=json.dumps([s.value for s in settings_data.tax_funding_order]),
             allow_retirement_withdrawals_for_taxes=settings_data.allow_retirement_withdrawals_for_taxes,
             if_insufficient_funds_behavior=settings_data.if_insufficient_funds_behavior,
             tax_table_indexing_policy=settings_data.tax_table_indexing_policy,
-            tax_table_custom_index_rate=settings_data.tax_table_custom_index_rate
+            tax_table_custom_index_rate=settings_data.tax_table_custom_index_rate,
+            order_entries=[
+                TaxFundingOrderEntry(position=i, source=source)
+                for i, source in enumerate(settings_data.tax_funding_order)
+            ]
         )
         session.add(settings)
     
     session.commit()
-    session.refresh(settings)
     
     # Return updated settings
-    tax_funding_order = [TaxFundingSource(s) for s in json.loads(settings.tax_funding_order_json)]
     return TaxFundingSettingsRead(
         id=settings.id,
         scenario_id=settings.scenario_id,
-        tax_funding_order=tax_funding_order,
+        tax_funding_order=settings_data.tax_funding_order,
         allow_retirement_withdrawals_for_taxes=settings.allow_retirement_withdrawals_for_taxes,
         if_insufficient_funds_behavior=settings.if_insufficient_funds_behavior,
         tax_table_indexing_policy=settings.tax_table_indexing_policy,
@@ -235,11 +341,6 @@ def _seed_default_tax_tables(session: Session, scenario: Scenario):
     Seed default tax tables for a scenario if they don't exist.
     Uses scenario's base_year (falling back to latest available) for the scenario's filing status.
     """
-    from sqlmodel import select
-    from datetime import datetime
-    import json
-    import traceback
-    
     try:
         # Check if tables already exist
         existing = session.exec(
@@ -251,7 +352,7 @@ def _seed_default_tax_tables(session: Session, scenario: Scenario):
             return
         
         # Determine base year (use scenario's base_year or current year)
-        base_year = scenario.base_year if scenario.base_year else datetime.utcnow().year
+        base_year = scenario.base_year if scenario.base_year else utcnow().year
         
         # We will try to fetch tables for base_year.
         # The helpers in tax_config handle fallback to the latest available year if base_year is missing.
@@ -263,7 +364,7 @@ def _seed_default_tax_tables(session: Session, scenario: Scenario):
             ca_table = get_state_tax_table("CA", base_year, scenario.filing_status)
         except (ValueError, NotImplementedError) as e:
             # If tables don't exist for this filing status/year, skip seeding
-            print(f"[WARN] Could not seed default tax tables: {e}")
+            logger.warning("Could not seed default tax tables: %s", e)
             return
         
         # Create federal table
@@ -293,11 +394,10 @@ def _seed_default_tax_tables(session: Session, scenario: Scenario):
         session.add(ca_tax_table)
         
         session.commit()
-        print(f"[DEBUG] Seeded default tax tables for scenario {scenario.id} (filing_status={scenario.filing_status}, base_year={base_year})")
+        logger.debug("Seeded default tax tables for scenario %s (filing_status=%s, base_year=%s)", scenario.id, scenario.filing_status, base_year)
         
     except Exception as e:
-        print(f"[ERROR] Error in _seed_default_tax_tables: {e}")
-        traceback.print_exc()
+        logger.exception("Error in _seed_default_tax_tables: %s", e)
         # Do not raise, just log and return. This ensures GET /tax-tables doesn't 500.
 
 
@@ -309,22 +409,20 @@ def get_tax_tables(scenario_id: int, session: Session = Depends(get_session)):
         if not scenario:
             raise HTTPException(status_code=404, detail="Scenario not found")
         
-        from sqlmodel import select
-        
         # Seed default tables if none exist
         _seed_default_tax_tables(session, scenario)
         
         tax_tables = session.exec(select(TaxTable).where(TaxTable.scenario_id == scenario_id)).all()
-        print("[DEBUG] brackets_json from DB:", [t.brackets_json for t in tax_tables])
+        logger.debug("brackets_json from DB: %s", [t.brackets_json for t in tax_tables])
 
-        print(f"[DEBUG] get_tax_tables: Found {len(tax_tables)} tax tables for scenario {scenario_id}")
+        logger.debug("get_tax_tables: Found %s tax tables for scenario %s", len(tax_tables), scenario_id)
         
         result = []
         for table in tax_tables:
             brackets = table.get_brackets()
-            print("[DEBUG] raw brackets:", brackets)
-            print("[DEBUG] table.id:", table.id)
-            print("[DEBUG] raw brackets_json:", table.brackets_json)
+            logger.debug("raw brackets: %s", brackets)
+            logger.debug("table.id: %s", table.id)
+            logger.debug("raw brackets_json: %s", table.brackets_json)
 
             result.append(TaxTableRead(
                 id=table.id,
@@ -350,9 +448,7 @@ def get_tax_tables(scenario_id: int, session: Session = Depends(get_session)):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"[ERROR] get_tax_tables failed: {e}")
-        traceback.print_exc()
+        logger.exception("get_tax_tables failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Error retrieving tax tables: {str(e)}")
 
 
@@ -367,8 +463,7 @@ def upsert_tax_table(
     if jurisdiction not in ("FED", "CA"):
         raise HTTPException(status_code=400, detail="jurisdiction must be 'FED' or 'CA'")
     
-    scenario = session.get(Scenario, scenario_id)
-    if not scenario:
+    if not crud.scenario_exists(session, scenario_id):
         raise HTTPException(status_code=404, detail="Scenario not found")
     
     # Validate brackets
@@ -392,10 +487,6 @@ def upsert_tax_table(
     if table_data.jurisdiction != jurisdiction:
         raise HTTPException(status_code=400, detail="jurisdiction in URL must match jurisdiction in body")
     
-    from sqlmodel import select
-    from datetime import datetime
-    import json
-    
     # Find existing table
     existing = session.exec(
         select(TaxTable).where(
@@ -413,7 +504,7 @@ def upsert_tax_table(
         existing.standard_deduction = table_data.standard_deduction
         existing.year_base = table_data.year_base
         existing.notes = table_data.notes
-        existing.updated_at = datetime.utcnow()
+        existing.updated_at = utcnow()
         tax_table = existing
     else:
         # Create new
@@ -429,7 +520,6 @@ def upsert_tax_table(
         session.add(tax_table)
     
     session.commit()
-    session.refresh(tax_table)
     
     return TaxTableRead(
         id=tax_table.id,
@@ -445,178 +535,106 @@ def upsert_tax_table(
         updated_at=tax_table.updated_at
     )
 
+def _asset_read(asset: Asset) -> AssetRead:
+    """
+    Build an AssetRead from an asset whose details (and RSU tranches) are already in memory,
+    either eager-loaded by get_assets_for_scenario or attached on create.
+    """
+    asset_dict = {
+        "id": asset.id,
+        "scenario_id": asset.scenario_id,
+        "name": asset.name,
+        "type": asset.type,
+        "current_balance": asset.current_balance,
+        "created_at": asset.created_at,
+        "updated_at": asset.updated_at,
+        "real_estate_details": None,
+        "general_equity_details": None,
+        "specific_stock_details": None,
+        "rsu_grant_details": None,
+        "cash_details": None
+    }
+    if asset.type == "real_estate" and asset.real_estate_details:
+        asset_dict["real_estate_details"] = RealEstateDetailsRead.model_validate(asset.real_estate_details)
+    elif asset.type == "general_equity" and asset.general_equity_details:
+        asset_dict["general_equity_details"] = GeneralEquityDetailsRead.model_validate(asset.general_equity_details)
+    elif asset.type == "specific_stock" and asset.specific_stock_details:
+        asset_dict["specific_stock_details"] = SpecificStockDetailsRead.model_validate(asset.specific_stock_details)
+    elif asset.type == "rsu_grant" and asset.rsu_grant_details:
+        rsu_grant = asset.rsu_grant_details
+        # Create RSUGrantDetailsRead with tranches
+        grant_dict = {
+            "id": rsu_grant.id,
+            "asset_id": rsu_grant.asset_id,
+            "employer": rsu_grant.employer,
+            "security_id": rsu_grant.security_id,
+            "grant_date": rsu_grant.grant_date,
+            "grant_value_type": rsu_grant.grant_value_type,
+            "grant_value": rsu_grant.grant_value,
+            "grant_fmv_at_grant": rsu_grant.grant_fmv_at_grant,
+            "shares_granted": rsu_grant.shares_granted,
+            "vesting_tranches": [RSUVestingTrancheRead.model_validate(t) for t in rsu_grant.vesting_tranches]
+        }
+        asset_dict["rsu_grant_details"] = RSUGrantDetailsRead(**grant_dict)
+    elif asset.type == "cash" and asset.cash_details:
+        asset_dict["cash_details"] = CashDetailsRead.model_validate(asset.cash_details)
+    return AssetRead(**asset_dict)
+
 @app.get("/api/scenarios/{scenario_id}/assets", response_model=List[AssetRead])
-def read_assets(scenario_id: int, session: Session = Depends(get_session)):
-    import traceback
-    from sqlmodel import select
-    from .models import RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, RSUGrantDetails, RSUVestingTranche, CashDetails
-    from .schemas import RealEstateDetailsRead, GeneralEquityDetailsRead, SpecificStockDetailsRead, RSUGrantDetailsRead, RSUVestingTrancheRead, CashDetailsRead
-    
-    print(f"[DEBUG] read_assets: Starting for scenario_id={scenario_id}")
+def read_assets(scenario_id: int, request: Request, response: Response, session: Session = Depends(get_session)):
+    logger.debug("read_assets: Starting for scenario_id=%s", scenario_id)
+    
+    cached, generation = crud.get_cached_asset_list(scenario_id)
+    if cached is not None:
+        etag, asset_list = cached
+        # The client's copy is current: skip response validation and serialization
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        logger.debug("read_assets: Returning %s cached assets", len(asset_list))
+        response.headers["ETag"] = etag
+        return asset_list
+    
+    # Only a miss needs this: entries are cached for existing scenarios, and deleting one invalidates its entry.
+    # Caching [] for a missing id would outlive the id being reused by the next scenario.
+    if not crud.scenario_exists(session, scenario_id):
+        raise HTTPException(status_code=404, detail="Scenario not found")
     
     try:
-        print(f"[DEBUG] read_assets: Calling get_assets_for_scenario...")
+        logger.debug("read_assets: Calling get_assets_for_scenario...")
         assets = crud.get_assets_for_scenario(session, scenario_id)
-        print(f"[DEBUG] read_assets: Retrieved {len(assets)} assets")
+        logger.debug("read_assets: Retrieved %s assets", len(assets))
     except Exception as e:
-        print(f"[ERROR] read_assets: Error in get_assets_for_scenario: {e}")
-        traceback.print_exc()
+        logger.exception("read_assets: Error in get_assets_for_scenario: %s", e)
         raise HTTPException(status_code=500, detail=f"Error loading assets: {str(e)}")
     
-    # Manually construct AssetRead objects to ensure relationships are properly serialized
+    # Details (and RSU tranches) were loaded with the assets by get_assets_for_scenario,
+    # one IN (...) query per table, so building each AssetRead is in-memory work
     result = []
     for idx, asset in enumerate(assets):
-        print(f"[DEBUG] read_assets: Processing asset {idx+1}/{len(assets)}: id={asset.id}, type={asset.type}, name={asset.name}")
-        asset_dict = {
-            "id": asset.id,
-            "scenario_id": asset.scenario_id,
-            "name": asset.name,
-            "type": asset.type,
-            "current_balance": asset.current_balance,
-            "real_estate_details": None,
-            "general_equity_details": None,
-            "specific_stock_details": None,
-            "rsu_grant_details": None,
-            "cash_details": None
-        }
-        
-        # Add datetime fields if they exist (optional fields)
-        if hasattr(asset, 'created_at'):
-            asset_dict["created_at"] = asset.created_at
-        if hasattr(asset, 'updated_at'):
-            asset_dict["updated_at"] = asset.updated_at
-        
+        logger.debug("read_assets: Processing asset %s/%s: id=%s, type=%s, name=%s", idx+1, len(assets), asset.id, asset.type, asset.name)
         try:
-            if asset.type == "real_estate":
-                print(f"[DEBUG] read_assets: Loading RealEstateDetails for asset {asset.id}")
-                re_detail = session.exec(select(RealEstateDetails).where(RealEstateDetails.asset_id == asset.id)).first()
-                if re_detail:
-                    asset_dict["real_estate_details"] = RealEstateDetailsRead.model_validate(re_detail)
-                    print(f"[DEBUG] read_assets: Loaded RealEstateDetails for asset {asset.id}")
-            elif asset.type == "general_equity":
-                print(f"[DEBUG] read_assets: Loading GeneralEquityDetails for asset {asset.id}")
-                ge_detail = session.exec(select(GeneralEquityDetails).where(GeneralEquityDetails.asset_id == asset.id)).first()
-                if ge_detail:
-                    asset_dict["general_equity_details"] = GeneralEquityDetailsRead.model_validate(ge_detail)
-                    print(f"[DEBUG] read_assets: Loaded GeneralEquityDetails for asset {asset.id}")
-            elif asset.type == "specific_stock":
-                print(f"[DEBUG] read_assets: Loading SpecificStockDetails for asset {asset.id}")
-                stock_detail = session.exec(select(SpecificStockDetails).where(SpecificStockDetails.asset_id == asset.id)).first()
-                if stock_detail:
-                    asset_dict["specific_stock_details"] = SpecificStockDetailsRead.model_validate(stock_detail)
-                    print(f"[DEBUG] read_assets: Loaded SpecificStockDetails for asset {asset.id}")
-            elif asset.type == "rsu_grant":
-                print(f"[DEBUG] read_assets: Loading RSUGrantDetails for asset {asset.id}")
-                rsu_grant = session.exec(select(RSUGrantDetails).where(RSUGrantDetails.asset_id == asset.id)).first()
-                if rsu_grant:
-                    print(f"[DEBUG] read_assets: Found RSUGrantDetails id={rsu_grant.id}, loading tranches...")
-                    # Load vesting tranches
-                    tranches = session.exec(select(RSUVestingTranche).where(RSUVestingTranche.rsu_grant_id == rsu_grant.id)).all()
-                    print(f"[DEBUG] read_assets: Found {len(tranches)} vesting tranches")
-                    # Create RSUGrantDetailsRead with tranches
-                    grant_dict = {
-                        "id": rsu_grant.id,
-                        "asset_id": rsu_grant.asset_id,
-                        "employer": rsu_grant.employer,
-                        "security_id": rsu_grant.security_id,
-                        "grant_date": rsu_grant.grant_date,
-                        "grant_value_type": rsu_grant.grant_value_type,
-                        "grant_value": rsu_grant.grant_value,
-                        "grant_fmv_at_grant": rsu_grant.grant_fmv_at_grant,
-                        "shares_granted": rsu_grant.shares_granted,
-                        "vesting_tranches": [RSUVestingTrancheRead.model_validate(t) for t in tranches]
-                    }
-                    asset_dict["rsu_grant_details"] = RSUGrantDetailsRead(**grant_dict)
-                    print(f"[DEBUG] read_assets: Created RSUGrantDetailsRead for asset {asset.id}")
-            elif asset.type == "cash":
-                print(f"[DEBUG] read_assets: Loading CashDetails for asset {asset.id}")
-                cash_detail = session.exec(select(CashDetails).where(CashDetails.asset_id == asset.id)).first()
-                if cash_detail:
-                    asset_dict["cash_details"] = CashDetailsRead.model_validate(cash_detail)
-                    print(f"[DEBUG] read_assets: Loaded CashDetails for asset {asset.id}")
+            result.append(_asset_read(asset))
         except Exception as e:
-            print(f"[ERROR] read_assets: Error loading details for asset {asset.id} (type: {asset.type}): {e}")
-            traceback.print_exc()
-            raise HTTPException(status_code=500, detail=f"Error loading details for asset {asset.id}: {str(e)}")
-        
-        try:
-            print(f"[DEBUG] read_assets: Creating AssetRead for asset {asset.id}...")
-            print(f"[DEBUG] read_assets: asset_dict keys: {list(asset_dict.keys())}")
-            asset_read = AssetRead(**asset_dict)
-            result.append(asset_read)
-            print(f"[DEBUG] read_assets: Successfully created AssetRead for asset {asset.id}")
-        except Exception as e:
-            error_msg = f"[ERROR] read_assets: Error creating AssetRead for asset {asset.id} (type: {asset.type}): {e}"
-            print(error_msg)
-            print(f"[ERROR] read_assets: Asset dict keys: {list(asset_dict.keys())}")
-            print(f"[ERROR] read_assets: Asset dict: {asset_dict}")
-            traceback.print_exc()
+            logger.exception("read_assets: Error serializing asset %s (type: %s): %s", asset.id, asset.type, e)
             raise HTTPException(status_code=500, detail=f"Error serializing asset {asset.id}: {str(e)}")
     
-    print(f"[DEBUG] read_assets: Successfully processed {len(result)} assets, returning result")
+    logger.debug("read_assets: Successfully processed %s assets, returning result", len(result))
+    # Tag the list by its content, computed once here and cached with it, so repeat reads can answer 304
+    etag = _content_etag(b"".join(asset.model_dump_json().encode() for asset in result))
+    crud.cache_asset_list(scenario_id, (etag, result), generation)
+    response.headers["ETag"] = etag
     return result
 
 @app.post("/api/scenarios/{scenario_id}/assets", response_model=AssetRead)
 def create_asset(scenario_id: int, asset: AssetCreate, session: Session = Depends(get_session)):
-    from sqlmodel import select
-    from .models import RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, RSUGrantDetails, RSUVestingTranche
-    from .schemas import RealEstateDetailsRead, GeneralEquityDetailsRead, SpecificStockDetailsRead, RSUGrantDetailsRead, RSUVestingTrancheRead
-    
-    scenario = crud.get_scenario(session, scenario_id)
-    if not scenario:
+    if not crud.scenario_exists(session, scenario_id):
         raise HTTPException(status_code=404, detail="Scenario not found")
     try:
         created_asset = crud.create_typed_asset(session, scenario_id, asset)
-        
-        # Manually construct AssetRead to ensure relationships are properly serialized
-        asset_dict = {
-            "id": created_asset.id,
-            "scenario_id": created_asset.scenario_id,
-            "name": created_asset.name,
-            "type": created_asset.type,
-            "current_balance": created_asset.current_balance,
-            "real_estate_details": None,
-            "general_equity_details": None,
-            "specific_stock_details": None,
-            "rsu_grant_details": None
-        }
-        
-        if created_asset.type == "real_estate":
-            re_detail = session.exec(select(RealEstateDetails).where(RealEstateDetails.asset_id == created_asset.id)).first()
-            if re_detail:
-                asset_dict["real_estate_details"] = RealEstateDetailsRead.model_validate(re_detail)
-        elif created_asset.type == "general_equity":
-            ge_detail = session.exec(select(GeneralEquityDetails).where(GeneralEquityDetails.asset_id == created_asset.id)).first()
-            if ge_detail:
-                asset_dict["general_equity_details"] = GeneralEquityDetailsRead.model_validate(ge_detail)
-        elif created_asset.type == "specific_stock":
-            stock_detail = session.exec(select(SpecificStockDetails).where(SpecificStockDetails.asset_id == created_asset.id)).first()
-            if stock_detail:
-                asset_dict["specific_stock_details"] = SpecificStockDetailsRead.model_validate(stock_detail)
-        elif created_asset.type == "rsu_grant":
-            rsu_grant = session.exec(select(RSUGrantDetails).where(RSUGrantDetails.asset_id == created_asset.id)).first()
-            if rsu_grant:
-                # Load vesting tranches
-                tranches = session.exec(select(RSUVestingTranche).where(RSUVestingTranche.rsu_grant_id == rsu_grant.id)).all()
-                grant_dict = {
-                    "id": rsu_grant.id,
-                    "asset_id": rsu_grant.asset_id,
-                    "employer": rsu_grant.employer,
-                    "security_id": rsu_grant.security_id,
-                    "grant_date": rsu_grant.grant_date,
-                    "grant_value_type": rsu_grant.grant_value_type,
-                    "grant_value": rsu_grant.grant_value,
-                    "grant_fmv_at_grant": rsu_grant.grant_fmv_at_grant,
-                    "shares_granted": rsu_grant.shares_granted,
-                    "vesting_tranches": [RSUVestingTrancheRead.model_validate(t) for t in tranches]
-                }
-                asset_dict["rsu_grant_details"] = RSUGrantDetailsRead(**grant_dict)
-        
-        return AssetRead(**asset_dict)
+        # The details were attached to the new asset in memory, so there is nothing to reload
+        return _asset_read(created_asset)
     except Exception as e:
-        import traceback
-        print(f"Error creating asset: {e}")
-        print(traceback.format_exc())
+        logger.exception("Error creating asset: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating asset: {str(e)}")
 
 @app.put("/api/assets/{asset_id}", response_model=AssetRead)
@@ -635,8 +653,7 @@ def delete_asset(asset_id: int, session: Session = Depends(get_session)):
 
 @app.post("/api/scenarios/{scenario_id}/income_sources", response_model=IncomeSourceRead)
 def create_income_source(scenario_id: int, income_source: IncomeSourceCreate, session: Session = Depends(get_session)):
-    scenario = crud.get_scenario(session, scenario_id)
-    if not scenario:
+    if not crud.scenario_exists(session, scenario_id):
         raise HTTPException(status_code=404, detail="Scenario not found")
     return crud.create_income_source(session, income_source, scenario_id)
 
@@ -666,22 +683,29 @@ def run_simulation(scenario_id: int, debug: bool = False, session: Session = Dep
             raise HTTPException(status_code=404, detail="Scenario not found or simulation failed")
         return result
     except Exception as e:
-        import traceback
-        print(f"Error running simulation: {e}")
-        print(traceback.format_exc())
+        logger.exception("Error running simulation: %s", e)
         raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
 
 # Security/Ticker endpoints
+def _securities_index(session: Session) -> dict:
+    """All securities as SecurityRead, indexed by id and symbol; served from crud's cache when warm."""
+    index, generation = crud.get_cached_securities()
+    if index is None:
+        # Only the SecurityRead columns, as plain rows: no Security objects are built
+        statement = select(Security.id, Security.symbol, Security.name, Security.assumed_appreciation_rate)
+        securities = [SecurityRead(**row._mapping) for row in session.exec(statement)]
+        index = crud.cache_securities(securities, generation)
+    return index
+
 @app.get("/api/securities", response_model=List[SecurityRead])
 def read_securities(session: Session = Depends(get_session)):
     """Get all securities."""
-    from sqlmodel import select
-    return session.exec(select(Security)).all()
+    return _securities_index(session)["all"]
 
 @app.get("/api/securities/{security_id}", response_model=SecurityRead)
 def read_security(security_id: int, session: Session = Depends(get_session)):
     """Get a security by ID."""
-    security = crud.get_security(session, security_id)
+    security = _securities_index(session)["by_id"].get(security_id)
     if not security:
         raise HTTPException(status_code=404, detail="Security not found")
     return security
@@ -689,7 +713,7 @@ def read_security(security_id: int, session: Session = Depends(get_session)):
 @app.get("/api/securities/symbol/{symbol}", response_model=SecurityRead)
 def read_security_by_symbol(symbol: str, session: Session = Depends(get_session)):
     """Get a security by symbol (ticker)."""
-    security = crud.get_security_by_symbol(session, symbol.upper())
+    security = _securities_index(session)["by_symbol"].get(symbol.upper())
     if not security:
         raise HTTPException(status_code=404, detail=f"Security with symbol {symbol} not found")
     return security
@@ -708,7 +732,6 @@ def create_or_get_security(security: SecurityCreate, session: Session = Depends(
 @app.get("/api/scenarios/{scenario_id}/rsu_forecasts", response_model=List[RSUGrantForecastRead])
 def read_rsu_forecasts(scenario_id: int, session: Session = Depends(get_session)):
     """Get all RSU grant forecasts for a scenario."""
-    from sqlmodel import select
     forecasts = session.exec(
         select(RSUGrantForecast).where(RSUGrantForecast.scenario_id == scenario_id)
     ).all()
@@ -721,17 +744,15 @@ def create_rsu_forecast(
     session: Session = Depends(get_session)
 ):
     """Create a new RSU grant forecast."""
-    scenario = crud.get_scenario(session, scenario_id)
-    if not scenario:
+    if not crud.scenario_exists(session, scenario_id):
         raise HTTPException(status_code=404, detail="Scenario not found")
     
     rsu_forecast = RSUGrantForecast(
         scenario_id=scenario_id,
-        **forecast.dict()
+        **forecast.model_dump()
     )
     session.add(rsu_forecast)
     session.commit()
-    session.refresh(rsu_forecast)
     return rsu_forecast
 
 @app.put("/api/rsu_forecasts/{forecast_id}", response_model=RSUGrantForecastRead)
@@ -745,12 +766,11 @@ def update_rsu_forecast(
     if not db_forecast:
         raise HTTPException(status_code=404, detail="RSU forecast not found")
     
-    for key, value in forecast.dict().items():
+    for key, value in forecast.model_dump().items():
         setattr(db_forecast, key, value)
     
     session.add(db_forecast)
     session.commit()
-    session.refresh(db_forecast)
     return db_forecast
 
 @app.delete("/api/rsu_forecasts/{forecast_id}")
@@ -766,11 +786,8 @@ def delete_rsu_forecast(forecast_id: int, session: Session = Depends(get_session
 
 # RSU Grant details endpoint (with unvested/vested breakdown)
 @app.get("/api/assets/{asset_id}/rsu_details")
-def get_rsu_grant_details(asset_id: int, session: Session = Depends(get_session)):
+def get_rsu_grant_details(asset_id: int, request: Request, session: Session = Depends(get_session)):
     """Get detailed RSU grant information including unvested/vested breakdown."""
-    from sqlmodel import select
-    from .models import RSUGrantDetails, RSUVestingTranche, SpecificStockDetails
-    from datetime import datetime
     
     asset = session.get(Asset, asset_id)
     if not asset:
@@ -786,9 +803,10 @@ def get_rsu_grant_details(asset_id: int, session: Session = Depends(get_session)
     if not rsu_grant:
         raise HTTPException(status_code=404, detail="RSU grant details not found")
     
-    # Get vesting tranches
+    # Get vesting tranches (only the columns the response uses)
     tranches = session.exec(
-        select(RSUVestingTranche).where(RSUVestingTranche.rsu_grant_id == rsu_grant.id)
+        select(RSUVestingTranche.id, RSUVestingTranche.vesting_date, RSUVestingTranche.percentage_of_grant)
+        .where(RSUVestingTranche.rsu_grant_id == rsu_grant.id)
         .order_by(RSUVestingTranche.vesting_date)
     ).all()
     
@@ -803,12 +821,11 @@ def get_rsu_grant_details(asset_id: int, session: Session = Depends(get_session)
     ).all()
     
     # Calculate unvested shares (total granted - sum of tranche percentages that have vested)
-    # For simplicity, we'll calculate based on tranches with vesting_date <= today
-    today = datetime.now().date()
-    total_vested_percentage = sum(
-        t.percentage_of_grant for t in tranches
-        if hasattr(t.vesting_date, 'date') and t.vesting_date.date() <= today
-    )
+    # For simplicity, we'll calculate based on tranches with vesting_date <= today.
+    # Tranches are ordered by vesting_date, so the vested ones are the prefix before tomorrow midnight.
+    tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), time.min)
+    vested_count = bisect_left(tranches, tomorrow, key=lambda t: t.vesting_date)
+    total_vested_percentage = sum(t.percentage_of_grant for t in tranches[:vested_count])
     unvested_percentage = 1.0 - total_vested_percentage
     unvested_shares = rsu_grant.shares_granted * unvested_percentage
     
@@ -816,7 +833,8 @@ def get_rsu_grant_details(asset_id: int, session: Session = Depends(get_session)
     # For now, use grant FMV as placeholder
     current_estimated_value = rsu_grant.shares_granted * rsu_grant.grant_fmv_at_grant
     
-    return {
+    # Plain dicts, floats and datetimes only: encode in one orjson pass instead of jsonable_encoder + json
+    return _json_response(request, orjson.dumps({
         "grant": {
             "id": rsu_grant.id,
             "employer": rsu_grant.employer,
@@ -859,4 +877,4 @@ def get_rsu_grant_details(asset_id: int, session: Session = Depends(get_session)
             }
             for lot in vested_lots
         ]
-    }
+    }))
@@ -0,0 +1,110 @@
+"""
+Apply the schema migration scripts in order on one connection, in one transaction.
+Each applied migration is recorded in schema_migrations, so re-running the runner skips it.
+Run from the project root: python -m backend.migrations.runner
+"""
+import logging
+import sqlite3
+import os
+from datetime import datetime, timezone
+
+from .. import (
+    add_appreciation_rate_to_security,
+    add_base_year_to_scenario,
+    add_rsu_columns_to_stock,
+    add_cascade_to_asset_details,
+    add_indexes,
+    add_cascade_to_scenario_children,
+    move_tax_funding_order_to_table,
+)
+
+logger = logging.getLogger(__name__)
+
+# Get the project root directory
+migrations_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(migrations_dir))
+db_file = os.path.join(project_root, "retirement_lab_v3.db")
+
+# Applied in this order; the version recorded for each is its module name
+MIGRATIONS = [
+    add_appreciation_rate_to_security,
+    add_base_year_to_scenario,
+    add_rsu_columns_to_stock,
+    add_cascade_to_asset_details,
+    add_indexes,
+    add_cascade_to_scenario_children,
+    move_tax_funding_order_to_table,
+]
+
+def _version(migration) -> str:
+    return migration.__name__.rsplit(".", 1)[-1]
+
+def run_migrations(conn) -> list:
+    """Apply pending migrations in a single transaction; returns the versions applied."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version TEXT PRIMARY KEY,
+            applied_at TIMESTAMP NOT NULL
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    applied = {row[0] for row in cursor.fetchall()}
+
+    pending = [m for m in MIGRATIONS if _version(m) not in applied]
+    if not pending:
+        logger.info("No pending migrations")
+        return []
+
+    # Table rebuilds need foreign key enforcement off, and that can only change outside a transaction
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for migration in pending:
+            version = _version(migration)
+            logger.info("Applying %s...", version)
+            migration.migrate(conn)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, applied_at) VALUES (?, ?)",
+                (version, datetime.now(timezone.utc).replace(tzinfo=None).isoformat(" ")),
+            )
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        cursor.execute("PRAGMA foreign_keys=ON")
+
+    return [_version(m) for m in pending]
+
+def migrate_database(path: str = db_file) -> list:
+    """
+    Open the database at `path` on its own connection and apply pending migrations.
+    init_db() calls this at app startup, so databases created by older versions are upgraded
+    before any request runs; returns the versions applied.
+    """
+    # isolation_level=None: transactions are managed explicitly with BEGIN/COMMIT above
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    try:
+        return run_migrations(conn)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    if not os.path.exists(db_file):
+        print(f"Database file not found: {db_file}")
+        exit(1)
+
+    try:
+        applied = migrate_database(db_file)
+        if not applied:
+            print("No pending migrations")
+        for version in applied:
+            print(f"Applied {version}")
+        print(f"\nApplied {len(applied)} migration(s) successfully!")
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        raise
@@ -1,9 +1,13 @@
 from typing import Optional, List
-from datetime import datetime
-from sqlmodel import Field, SQLModel, Relationship
+from datetime import datetime, timezone
+from sqlmodel import Field, SQLModel, Relationship, UniqueConstraint, func
 from enum import Enum
 import json
 
+def utcnow() -> datetime:
+    """Naive UTC now: what datetime.utcnow() returns, without its Python 3.12 deprecation warning."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class TaxWrapper(str, Enum):
     TAXABLE = "taxable"            # Brokerage account, individual stock account
     TRADITIONAL = "traditional"    # 401k, Traditional IRA, other pre-tax
@@ -27,6 +31,14 @@ class TaxFundingSource(str, Enum):
     TRADITIONAL_RETIREMENT = "TRADITIONAL_RETIREMENT"
     ROTH = "ROTH"
 
+# Funding order for scenarios without saved TaxFundingSettings
+DEFAULT_TAX_FUNDING_ORDER = (
+    TaxFundingSource.CASH,
+    TaxFundingSource.TAXABLE_BROKERAGE,
+    TaxFundingSource.TRADITIONAL_RETIREMENT,
+    TaxFundingSource.ROTH,
+)
+
 class InsufficientFundsBehavior(str, Enum):
     FAIL_WITH_SHORTFALL = "FAIL_WITH_SHORTFALL"
     LIQUIDATE_ALL_AVAILABLE = "LIQUIDATE_ALL_AVAILABLE"
@@ -52,46 +64,51 @@ class Scenario(SQLModel, table=True):
     annual_contribution_pre_retirement: float
     annual_spending_in_retirement: float
     filing_status: FilingStatus = Field(default=FilingStatus.MARRIED_FILING_JOINTLY)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Stamped by the database (CURRENT_TIMESTAMP, UTC) in the INSERT/UPDATE itself;
+    # eager_defaults reads them back through RETURNING
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"default": func.now(), "onupdate": func.now()})
 
-    assets: List["Asset"] = Relationship(back_populates="scenario")
-    income_sources: List["IncomeSource"] = Relationship(back_populates="scenario")
-    rsu_grant_forecasts: List["RSUGrantForecast"] = Relationship(back_populates="scenario")
-    tax_funding_settings: Optional["TaxFundingSettings"] = Relationship(back_populates="scenario", sa_relationship_kwargs={"uselist": False})
-    tax_tables: List["TaxTable"] = Relationship(back_populates="scenario", sa_relationship_kwargs={"lazy": "select"})
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Child rows are removed by ON DELETE CASCADE; passive_deletes keeps the ORM from loading them first
+    assets: List["Asset"] = Relationship(back_populates="scenario", sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True})
+    income_sources: List["IncomeSource"] = Relationship(back_populates="scenario", sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True})
+    rsu_grant_forecasts: List["RSUGrantForecast"] = Relationship(back_populates="scenario", sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True})
+    tax_funding_settings: Optional["TaxFundingSettings"] = Relationship(back_populates="scenario", sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan", "passive_deletes": True})
+    tax_tables: List["TaxTable"] = Relationship(back_populates="scenario", sa_relationship_kwargs={"lazy": "select", "cascade": "all, delete-orphan", "passive_deletes": True})
 
 class Asset(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    scenario_id: int = Field(foreign_key="scenario.id")
+    scenario_id: int = Field(foreign_key="scenario.id", ondelete="CASCADE", index=True)
     name: str
     type: str  # "general_equity", "specific_stock", "real_estate", "rsu_grant", "cash"
     current_balance: float = Field(default=0.0)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     scenario: Optional[Scenario] = Relationship(back_populates="assets")
-    general_equity_details: Optional["GeneralEquityDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False})
-    specific_stock_details: Optional["SpecificStockDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False})
-    real_estate_details: Optional["RealEstateDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False})
-    rsu_grant_details: Optional["RSUGrantDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False})
-    cash_details: Optional["CashDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False})
+    general_equity_details: Optional["GeneralEquityDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan", "passive_deletes": True})
+    specific_stock_details: Optional["SpecificStockDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan", "passive_deletes": True})
+    real_estate_details: Optional["RealEstateDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan", "passive_deletes": True})
+    rsu_grant_details: Optional["RSUGrantDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan", "passive_deletes": True})
+    cash_details: Optional["CashDetails"] = Relationship(back_populates="asset", sa_relationship_kwargs={"uselist": False, "cascade": "all, delete-orphan", "passive_deletes": True})
 
 class GeneralEquityDetails(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    asset_id: int = Field(foreign_key="asset.id", unique=True)
+    asset_id: int = Field(foreign_key="asset.id", unique=True, ondelete="CASCADE")
     expected_return_rate: float
     fee_rate: float = Field(default=0.0)
     annual_contribution: float = Field(default=0.0)
     tax_wrapper: TaxWrapper = Field(default=TaxWrapper.TAXABLE)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     asset: Optional[Asset] = Relationship(back_populates="general_equity_details")
 
 class SpecificStockDetails(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    asset_id: int = Field(foreign_key="asset.id", unique=True)
+    asset_id: int = Field(foreign_key="asset.id", unique=True, ondelete="CASCADE")
     security_id: int = Field(foreign_key="security.id")
     shares_owned: float
     average_cost_basis: float
@@ -99,14 +116,14 @@ class SpecificStockDetails(SQLModel, table=True):
     tax_wrapper: TaxWrapper = Field(default=TaxWrapper.TAXABLE)
     source_type: Optional[str] = Field(default="user_entered") # "user_entered" or "rsu_vesting"
     source_rsu_grant_id: Optional[int] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     asset: Optional[Asset] = Relationship(back_populates="specific_stock_details")
 
 class RealEstateDetails(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    asset_id: int = Field(foreign_key="asset.id", unique=True)
+    asset_id: int = Field(foreign_key="asset.id", unique=True, ondelete="CASCADE")
     property_value: float
     mortgage_balance: Optional[float] = None
     mortgage_term_years: int = Field(default=30)
@@ -123,14 +140,14 @@ class RealEstateDetails(SQLModel, table=True):
     primary_residence_end_age: Optional[int] = None
     appreciation_rate: float = Field(default=0.03)
     annual_rent: Optional[float] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     asset: Optional[Asset] = Relationship(back_populates="real_estate_details")
 
 class RSUGrantDetails(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    asset_id: int = Field(foreign_key="asset.id", unique=True)
+    asset_id: int = Field(foreign_key="asset.id", unique=True, ondelete="CASCADE")
     employer: Optional[str] = None
     security_id: int = Field(foreign_key="security.id")
     grant_date: datetime
@@ -138,28 +155,28 @@ class RSUGrantDetails(SQLModel, table=True):
     grant_value: float  # Dollar value if grant_value_type == "dollar_value", else number of shares
     grant_fmv_at_grant: float  # Fair market value per share at grant date
     shares_granted: float  # Total shares granted (calculated or provided)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     asset: Optional[Asset] = Relationship(back_populates="rsu_grant_details")
-    vesting_tranches: List["RSUVestingTranche"] = Relationship(back_populates="rsu_grant")
+    vesting_tranches: List["RSUVestingTranche"] = Relationship(back_populates="rsu_grant", sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True})
 
 class RSUVestingTranche(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    rsu_grant_id: int = Field(foreign_key="rsugrantdetails.id")
+    rsu_grant_id: int = Field(foreign_key="rsugrantdetails.id", ondelete="CASCADE", index=True)
     vesting_date: datetime
     percentage_of_grant: float  # e.g., 0.25 for 25%
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     rsu_grant: Optional[RSUGrantDetails] = Relationship(back_populates="vesting_tranches")
 
 class CashDetails(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    asset_id: int = Field(foreign_key="asset.id", unique=True)
+    asset_id: int = Field(foreign_key="asset.id", unique=True, ondelete="CASCADE")
     balance: float = Field(default=0.0)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     asset: Optional[Asset] = Relationship(back_populates="cash_details")
 
@@ -168,26 +185,26 @@ class Security(SQLModel, table=True):
     symbol: str = Field(unique=True)
     name: Optional[str] = None
     assumed_appreciation_rate: float = Field(default=0.07)  # Default 7% annual return
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 class IncomeSource(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    scenario_id: int = Field(foreign_key="scenario.id")
+    scenario_id: int = Field(foreign_key="scenario.id", ondelete="CASCADE", index=True)
     name: str
     income_type: IncomeType
     start_age: int
     end_age: Optional[int] = None
     annual_amount: float
     inflation_adjusted: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     scenario: Optional[Scenario] = Relationship(back_populates="income_sources")
 
 class RSUGrantForecast(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    scenario_id: int = Field(foreign_key="scenario.id")
+    scenario_id: int = Field(foreign_key="scenario.id", ondelete="CASCADE", index=True)
     employer: Optional[str] = None
     security_id: int = Field(foreign_key="security.id")
     grant_date: datetime
@@ -195,18 +212,14 @@ class RSUGrantForecast(SQLModel, table=True):
     grant_value: float
     grant_fmv_at_grant: float
     shares_granted: float
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
     scenario: Optional[Scenario] = Relationship(back_populates="rsu_grant_forecasts")
 
 class TaxFundingSettings(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    scenario_id: int = Field(foreign_key="scenario.id", unique=True)
-    
-    # Tax funding order as JSON string (array of TaxFundingSource enums)
-    # Default: ["CASH", "TAXABLE_BROKERAGE", "TRADITIONAL_RETIREMENT", "ROTH"]
-    tax_funding_order_json: str = Field(default='["CASH", "TAXABLE_BROKERAGE", "TRADITIONAL_RETIREMENT", "ROTH"]')
+    scenario_id: int = Field(foreign_key="scenario.id", unique=True, ondelete="CASCADE")
     
     allow_retirement_withdrawals_for_taxes: bool = Field(default=True)
     if_insufficient_funds_behavior: InsufficientFundsBehavior = Field(default=InsufficientFundsBehavior.FAIL_WITH_SHORTFALL)
@@ -215,10 +228,23 @@ class TaxFundingSettings(SQLModel, table=True):
     tax_table_indexing_policy: TaxTableIndexingPolicy = Field(default=TaxTableIndexingPolicy.CONSTANT_NOMINAL)
     tax_table_custom_index_rate: Optional[float] = Field(default=None)  # Used only when CUSTOM_RATE (as decimal, e.g., 0.03 for 3%)
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
     
     scenario: Optional[Scenario] = Relationship(back_populates="tax_funding_settings")
+    # Tax funding order, highest priority first; rows are removed by ON DELETE CASCADE
+    order_entries: List["TaxFundingOrderEntry"] = Relationship(back_populates="settings", sa_relationship_kwargs={"order_by": "TaxFundingOrderEntry.position", "cascade": "all, delete-orphan", "passive_deletes": True})
+
+class TaxFundingOrderEntry(SQLModel, table=True):
+    """One funding source in a scenario's tax funding order (position 0 is drawn from first)."""
+    __table_args__ = (UniqueConstraint("settings_id", "position"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    settings_id: int = Field(foreign_key="taxfundingsettings.id", ondelete="CASCADE")
+    position: int
+    source: TaxFundingSource
+
+    settings: Optional[TaxFundingSettings] = Relationship(back_populates="order_entries")
 
 class TaxTable(SQLModel, table=True):
     """
@@ -226,7 +252,7 @@ class TaxTable(SQLModel, table=True):
     Each record represents one jurisdiction (FED or CA) for one filing status.
     """
     id: Optional[int] = Field(default=None, primary_key=True)
-    scenario_id: int = Field(foreign_key="scenario.id")
+    scenario_id: int = Field(foreign_key="scenario.id", ondelete="CASCADE", index=True)
     
     jurisdiction: str = Field(default="FED")  # "FED" or "CA"
     filing_status: FilingStatus = Field(default=FilingStatus.MARRIED_FILING_JOINTLY)
@@ -241,8 +267,8 @@ class TaxTable(SQLModel, table=True):
     schema_version: str = Field(default="1.0")
     notes: Optional[str] = None
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
     
     scenario: Optional[Scenario] = Relationship(back_populates="tax_tables")
     
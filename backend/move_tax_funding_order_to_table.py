@@ -0,0 +1,122 @@
+"""
+Migration script to move each scenario's tax funding order out of the
+taxfundingsettings.tax_funding_order_json column into the taxfundingorderentry table
+(one row per funding source, ordered by position), then drop the JSON column.
+Run this once to update the existing database schema
+(or apply all migrations with `python -m backend.migrations.runner`).
+"""
+import sqlite3
+import os
+import json
+
+# Get the project root directory
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(backend_dir)
+db_file = os.path.join(project_root, "retirement_lab_v3.db")
+
+COLUMN = "tax_funding_order_json"
+
+# Native DROP COLUMN arrived in SQLite 3.35.0
+HAS_DROP_COLUMN = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+def _rebuild_taxfundingsettings(cursor):
+    cursor.execute("""
+        CREATE TABLE taxfundingsettings_new (
+            id INTEGER NOT NULL,
+            scenario_id INTEGER NOT NULL,
+            allow_retirement_withdrawals_for_taxes BOOLEAN NOT NULL,
+            if_insufficient_funds_behavior VARCHAR(23) NOT NULL,
+            tax_table_indexing_policy VARCHAR(18) NOT NULL,
+            tax_table_custom_index_rate FLOAT,
+            created_at DATETIME NOT NULL,
+            updated_at DATETIME NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (scenario_id),
+            FOREIGN KEY(scenario_id) REFERENCES scenario (id) ON DELETE CASCADE
+        )
+    """)
+
+    # Copy data (excluding the dropped column)
+    cursor.execute("""
+        INSERT INTO taxfundingsettings_new
+        (id, scenario_id, allow_retirement_withdrawals_for_taxes, if_insufficient_funds_behavior,
+         tax_table_indexing_policy, tax_table_custom_index_rate, created_at, updated_at)
+        SELECT id, scenario_id, allow_retirement_withdrawals_for_taxes, if_insufficient_funds_behavior,
+               tax_table_indexing_policy, tax_table_custom_index_rate, created_at, updated_at
+        FROM taxfundingsettings
+    """)
+
+    # Drop old table and rename new one
+    cursor.execute("DROP TABLE taxfundingsettings")
+    cursor.execute("ALTER TABLE taxfundingsettings_new RENAME TO taxfundingsettings")
+
+def migrate(conn):
+    """Expects foreign key enforcement to be off on the legacy path (it can't be toggled inside a transaction)."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='taxfundingsettings'")
+    if cursor.fetchone() is None:
+        print("taxfundingsettings table not found, skipping")
+        return
+
+    cursor.execute("PRAGMA table_info(taxfundingsettings)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if COLUMN not in columns:
+        print(f"{COLUMN} column not found (may have been migrated already)")
+        return
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS taxfundingorderentry (
+            id INTEGER NOT NULL,
+            settings_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            source VARCHAR(22) NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (settings_id, position),
+            FOREIGN KEY(settings_id) REFERENCES taxfundingsettings (id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute(f"SELECT id, {COLUMN} FROM taxfundingsettings")
+    entries = [
+        (settings_id, position, source)
+        for settings_id, order_json in cursor.fetchall()
+        for position, source in enumerate(json.loads(order_json or "[]"))
+    ]
+    cursor.executemany(
+        "INSERT INTO taxfundingorderentry (settings_id, position, source) VALUES (?, ?, ?)",
+        entries,
+    )
+    print(f"Copied {len(entries)} tax funding order entries")
+
+    print(f"Dropping {COLUMN} column from taxfundingsettings...")
+    if HAS_DROP_COLUMN:
+        cursor.execute(f"ALTER TABLE taxfundingsettings DROP COLUMN {COLUMN}")
+    else:
+        _rebuild_taxfundingsettings(cursor)
+    print("Dropped column from taxfundingsettings")
+
+if __name__ == "__main__":
+    if not os.path.exists(db_file):
+        print(f"Database file not found: {db_file}")
+        exit(1)
+
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    # Foreign key enforcement must be off while tables are dropped and renamed
+    conn.execute("PRAGMA foreign_keys=OFF")
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        migrate(conn)
+        conn.commit()
+        print("\nMigration completed successfully!")
+
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.close()
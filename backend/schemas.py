@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from sqlmodel import SQLModel
 
 from .models import TaxWrapper, IncomeType, DepreciationMethod, TaxFundingSource, InsufficientFundsBehavior, TaxTableIndexingPolicy
@@ -27,6 +27,18 @@ class ScenarioRead(ScenarioBase):
     created_at: datetime
     updated_at: datetime
 
+class ScenarioReadWithCounts(ScenarioRead):
+    asset_count: int = 0
+    income_source_count: int = 0
+
+class ScenarioSummaryRead(BaseModel):
+    """The columns the scenario list renders."""
+    id: int
+    name: str
+    current_age: int
+    retirement_age: int
+    created_at: datetime
+
 class IncomeSourceBase(SQLModel):
     name: str
     amount: float
@@ -197,7 +209,14 @@ class TaxFundingSettingsBase(SQLModel):
     tax_table_custom_index_rate: Optional[float] = None  # Used only when CUSTOM_RATE (as decimal, e.g., 0.03 for 3%)
 
 class TaxFundingSettingsCreate(TaxFundingSettingsBase):
-    pass
+    @model_validator(mode="after")
+    def check_tax_funding_order(self):
+        # Unknown sources are already rejected by the TaxFundingSource enum; failures here surface as 422
+        if not self.tax_funding_order:
+            raise ValueError("tax_funding_order must contain at least one source")
+        if len(set(self.tax_funding_order)) != len(self.tax_funding_order):
+            raise ValueError("tax_funding_order contains duplicate entries")
+        return self
 
 class TaxFundingSettingsRead(TaxFundingSettingsBase):
     id: int
@@ -1,17 +1,19 @@
 from typing import Dict, List, Tuple, Optional
-import sys
+import logging
 from datetime import datetime
 from sqlmodel import Session, select
-from .models import Scenario, Asset, RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, IncomeSource, TaxWrapper, IncomeType, DepreciationMethod, Security, RSUGrantDetails, RSUVestingTranche, TaxFundingSettings, TaxFundingSource, InsufficientFundsBehavior, TaxTable
+from sqlalchemy.orm import selectinload
+from .models import Scenario, Asset, RealEstateDetails, GeneralEquityDetails, SpecificStockDetails, IncomeSource, TaxWrapper, IncomeType, DepreciationMethod, Security, RSUGrantDetails, RSUVestingTranche, TaxFundingSettings, TaxFundingSource, DEFAULT_TAX_FUNDING_ORDER, InsufficientFundsBehavior, TaxTable
 from .crud import get_assets_for_scenario, get_income_sources_for_scenario, get_security, get_security_by_symbol
 from .tax_engine import TaxableIncomeBreakdown, calculate_taxes, TaxResult
 from .tax_config import FilingStatus, TaxTable as TaxTableConfig, TaxBracket
-import json
 
-# Helper function to print and flush immediately
-def print_flush(*args, **kwargs):
-    print(*args, **kwargs)
-    sys.stdout.flush()
+logger = logging.getLogger(__name__)
+
+# Simulation trace output; goes to the DEBUG log instead of a flushed stdout write.
+# Call sites in the yearly loop check trace_enabled first, so the f-strings are only built when DEBUG is on.
+def debug_log(*args):
+    logger.debug(" ".join(str(arg) for arg in args))
 
 def extract_tax_numbers(tax_result) -> Tuple[float, float, float]:
     """
@@ -25,8 +27,6 @@ def extract_tax_numbers(tax_result) -> Tuple[float, float, float]:
     tax_dict = None
     if hasattr(tax_result, 'model_dump'):
         tax_dict = tax_result.model_dump()
-    elif hasattr(tax_result, 'dict'):
-        tax_dict = tax_result.dict()
     elif isinstance(tax_result, dict):
         tax_dict = tax_result
     
@@ -469,20 +469,20 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
     
     # Load tax funding settings
     tax_settings = session.exec(
-        select(TaxFundingSettings).where(TaxFundingSettings.scenario_id == scenario_id)
+        select(TaxFundingSettings)
+        .where(TaxFundingSettings.scenario_id == scenario_id)
+        .options(selectinload(TaxFundingSettings.order_entries))
     ).first()
     
     # Default tax funding settings if not found
     if not tax_settings:
-        default_order = [TaxFundingSource.CASH, TaxFundingSource.TAXABLE_BROKERAGE, 
-                        TaxFundingSource.TRADITIONAL_RETIREMENT, TaxFundingSource.ROTH]
-        tax_funding_order = default_order
+        tax_funding_order = list(DEFAULT_TAX_FUNDING_ORDER)
         allow_retirement_withdrawals = True
         if_insufficient_funds_behavior = InsufficientFundsBehavior.FAIL_WITH_SHORTFALL
         indexing_policy = "CONSTANT_NOMINAL"
         custom_index_rate = None
     else:
-        tax_funding_order = [TaxFundingSource(s) for s in json.loads(tax_settings.tax_funding_order_json)]
+        tax_funding_order = [entry.source for entry in tax_settings.order_entries]
         allow_retirement_withdrawals = tax_settings.allow_retirement_withdrawals_for_taxes
         if_insufficient_funds_behavior = tax_settings.if_insufficient_funds_behavior
         indexing_policy = tax_settings.tax_table_indexing_policy.value
@@ -591,7 +591,9 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
     # Structure: {security_id: {"shares": float, "basis_per_share": float, ...}}
     vested_stock_holdings = {}
     
-    print(f"DEBUG: Running simulation for scenario {scenario.id}. Range: {scenario.current_age} to {scenario.end_age}")
+    logger.debug("Running simulation for scenario %s. Range: %s to %s", scenario.id, scenario.current_age, scenario.end_age)
+    # The per-year trace below formats dozens of f-strings; only build them when DEBUG output is on
+    trace_enabled = logger.isEnabledFor(logging.DEBUG)
     
     for asset in assets:
         if asset.type == "real_estate" and asset.id in asset_details:
@@ -1007,14 +1009,15 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                             year_trace["rsu"][asset_id]["fmv_at_vest"] = fmv_on_vest
                             year_trace["rsu"][asset_id]["vested_value_this_year"] += vesting_income
                         
-                        print_flush(f"\nRSU VESTING - Age {age}, Year {sim_year}")
-                        print_flush(f"  Grant ID: {grant_id}")
-                        print_flush(f"  Shares vesting: {shares_vesting:.4f}")
-                        print_flush(f"  FMV per share at vest: ${fmv_on_vest:.2f}")
-                        print_flush(f"  Vesting income (ordinary): ${vesting_income:,.2f}")
-                        print_flush(f"  Shares received: {shares_vesting:.4f} (all shares, no withholding)")
-                        print_flush(f"  Basis per share: ${basis_per_share:.2f}")
-                        print_flush(f"  Total basis: ${basis_total:,.2f}")
+                        if trace_enabled:
+                            debug_log(f"\nRSU VESTING - Age {age}, Year {sim_year}")
+                            debug_log(f"  Grant ID: {grant_id}")
+                            debug_log(f"  Shares vesting: {shares_vesting:.4f}")
+                            debug_log(f"  FMV per share at vest: ${fmv_on_vest:.2f}")
+                            debug_log(f"  Vesting income (ordinary): ${vesting_income:,.2f}")
+                            debug_log(f"  Shares received: {shares_vesting:.4f} (all shares, no withholding)")
+                            debug_log(f"  Basis per share: ${basis_per_share:.2f}")
+                            debug_log(f"  Total basis: ${basis_total:,.2f}")
                 
                 # Update vested_lots in state
                 st["vested_lots"] = vested_lots
@@ -1038,9 +1041,10 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                         # Only process if it's a real estate asset and not already sold
                         if st.get("type") == "real_estate" and not st.get("sold", False):
                             house_sale_this_year = True  # Mark that a house sale is happening this year
-                            print_flush(f"\n{'='*80}")
-                            print_flush(f"HOUSE SALE CALCULATION - Age {age}")
-                            print_flush(f"{'='*80}")
+                            if trace_enabled:
+                                debug_log(f"\n{'='*80}")
+                                debug_log(f"HOUSE SALE CALCULATION - Age {age}")
+                                debug_log(f"{'='*80}")
                             
                             # Calculate appreciated property value at time of sale
                             # Property value is from end of previous year, appreciate one more year for sale
@@ -1048,13 +1052,15 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                             property_value_prev_year = st.get("property_value", 0.0)
                             current_property_value = property_value_prev_year * (1 + appreciation_rate)
                             
-                            print_flush(f"Property value (end of prev year): ${property_value_prev_year:,.2f}")
-                            print_flush(f"Appreciation rate: {appreciation_rate*100:.2f}%")
-                            print_flush(f"Property value at sale: ${current_property_value:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"Property value (end of prev year): ${property_value_prev_year:,.2f}")
+                                debug_log(f"Appreciation rate: {appreciation_rate*100:.2f}%")
+                                debug_log(f"Property value at sale: ${current_property_value:,.2f}")
                             
                             # Mortgage balance at time of sale
                             mortgage_balance_at_sale = st.get("mortgage_balance", 0.0)
-                            print_flush(f"Mortgage balance at sale: ${mortgage_balance_at_sale:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"Mortgage balance at sale: ${mortgage_balance_at_sale:,.2f}")
                             
                             # Get property details
                             purchase_price = st.get("purchase_price", 0.0)
@@ -1062,11 +1068,12 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                             accumulated_depreciation = st.get("accumulated_depreciation", 0.0)
                             property_type = st.get("property_type", "rental")
                             
-                            print_flush(f"\nProperty Details:")
-                            print_flush(f"  Purchase price: ${purchase_price:,.2f}")
-                            print_flush(f"  Land value: ${land_value:,.2f}")
-                            print_flush(f"  Accumulated depreciation: ${accumulated_depreciation:,.2f}")
-                            print_flush(f"  Property type: {property_type}")
+                            if trace_enabled:
+                                debug_log(f"\nProperty Details:")
+                                debug_log(f"  Purchase price: ${purchase_price:,.2f}")
+                                debug_log(f"  Land value: ${land_value:,.2f}")
+                                debug_log(f"  Accumulated depreciation: ${accumulated_depreciation:,.2f}")
+                                debug_log(f"  Property type: {property_type}")
                             
                             # Calculate sale proceeds and taxes
                             net_sale_price, depreciation_recapture, capital_gain = calculate_property_sale(
@@ -1083,34 +1090,38 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                             )
                             
                             sales_costs = current_property_value * 0.05
-                            print_flush(f"\nSale Calculation:")
-                            print_flush(f"  Sale price: ${current_property_value:,.2f}")
-                            print_flush(f"  Sales costs (5%): ${sales_costs:,.2f}")
-                            print_flush(f"  Net sale price (after costs): ${net_sale_price:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"\nSale Calculation:")
+                                debug_log(f"  Sale price: ${current_property_value:,.2f}")
+                                debug_log(f"  Sales costs (5%): ${sales_costs:,.2f}")
+                                debug_log(f"  Net sale price (after costs): ${net_sale_price:,.2f}")
                             
                             # Net proceeds after mortgage = net_sale_price - mortgage_balance_at_sale
                             net_proceeds_after_mortgage = net_sale_price - mortgage_balance_at_sale
                             house_sale_net_proceeds = net_proceeds_after_mortgage  # Store for verification
-                            print_flush(f"  Net proceeds after mortgage: ${net_proceeds_after_mortgage:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"  Net proceeds after mortgage: ${net_proceeds_after_mortgage:,.2f}")
                             
                             # Add taxable portions to income buckets for tax calculation
                             # Note: These are the full taxable amounts from the sale (not reduced by mortgage)
-                            print_flush(f"\nTaxable Portions (BEFORE adding to income buckets):")
-                            print_flush(f"  Depreciation recapture: ${depreciation_recapture:,.2f}")
-                            print_flush(f"  Capital gain: ${capital_gain:,.2f}")
-                            print_flush(f"  Total taxable gain: ${depreciation_recapture + capital_gain:,.2f}")
-                            print_flush(f"\nIncome Buckets BEFORE house sale addition:")
-                            print_flush(f"  ordinary_income: ${ordinary_income:,.2f}")
-                            print_flush(f"  long_term_cap_gains: ${long_term_cap_gains:,.2f}")
-                            print_flush(f"  tax_exempt_income: ${tax_exempt_income:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"\nTaxable Portions (BEFORE adding to income buckets):")
+                                debug_log(f"  Depreciation recapture: ${depreciation_recapture:,.2f}")
+                                debug_log(f"  Capital gain: ${capital_gain:,.2f}")
+                                debug_log(f"  Total taxable gain: ${depreciation_recapture + capital_gain:,.2f}")
+                                debug_log(f"\nIncome Buckets BEFORE house sale addition:")
+                                debug_log(f"  ordinary_income: ${ordinary_income:,.2f}")
+                                debug_log(f"  long_term_cap_gains: ${long_term_cap_gains:,.2f}")
+                                debug_log(f"  tax_exempt_income: ${tax_exempt_income:,.2f}")
                             
                             ordinary_income += depreciation_recapture  # Depreciation recapture is ordinary income
                             long_term_cap_gains += capital_gain  # Capital gain is LTCG
                             
-                            print_flush(f"\nIncome Buckets AFTER adding taxable portions:")
-                            print_flush(f"  ordinary_income: ${ordinary_income:,.2f} (added ${depreciation_recapture:,.2f})")
-                            print_flush(f"  long_term_cap_gains: ${long_term_cap_gains:,.2f} (added ${capital_gain:,.2f})")
-                            print_flush(f"  tax_exempt_income: ${tax_exempt_income:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"\nIncome Buckets AFTER adding taxable portions:")
+                                debug_log(f"  ordinary_income: ${ordinary_income:,.2f} (added ${depreciation_recapture:,.2f})")
+                                debug_log(f"  long_term_cap_gains: ${long_term_cap_gains:,.2f} (added ${capital_gain:,.2f})")
+                                debug_log(f"  tax_exempt_income: ${tax_exempt_income:,.2f}")
                             
                             # Calculate return of capital (basis portion that's not taxable)
                             # The adjusted_basis is returned tax-free, but we need to account for the mortgage payment
@@ -1119,8 +1130,9 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                             # The return of capital is the basis portion, which is tax-free
                             adjusted_basis = st.get("purchase_price", 0.0) - st.get("accumulated_depreciation", 0.0)
                             
-                            print_flush(f"\nBasis Calculation:")
-                            print_flush(f"  Adjusted basis: ${adjusted_basis:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"\nBasis Calculation:")
+                                debug_log(f"  Adjusted basis: ${adjusted_basis:,.2f}")
                             
                             # The return of capital is the basis portion of what we actually received
                             # Since net_proceeds_after_mortgage = net_sale_price - mortgage, and the mortgage
@@ -1130,11 +1142,13 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                                 # Calculate the proportion of net_proceeds that is return of capital
                                 basis_ratio = min(1.0, adjusted_basis / net_sale_price)
                                 return_of_capital_received = net_proceeds_after_mortgage * basis_ratio
-                                print_flush(f"  Basis ratio: {basis_ratio:.4f} ({basis_ratio*100:.2f}%)")
-                                print_flush(f"  Return of capital received: ${return_of_capital_received:,.2f}")
+                                if trace_enabled:
+                                    debug_log(f"  Basis ratio: {basis_ratio:.4f} ({basis_ratio*100:.2f}%)")
+                                    debug_log(f"  Return of capital received: ${return_of_capital_received:,.2f}")
                             else:
                                 return_of_capital_received = 0.0
-                                print_flush(f"  Return of capital received: $0.00 (net_sale_price <= 0)")
+                                if trace_enabled:
+                                    debug_log(f"  Return of capital received: $0.00 (net_sale_price <= 0)")
                             
                             # Add return of capital to tax_exempt_income (basis portion, not taxable)
                             tax_exempt_income += return_of_capital_received
@@ -1181,52 +1195,63 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
                                 gain_ratio = total_taxable_gain / net_sale_price
                                 missing_portion = mortgage_balance_at_sale * gain_ratio
                                 # Add this missing portion to tax_exempt_income to make total income = net_proceeds_after_mortgage
-                                print_flush(f"\nBefore adding missing portion:")
-                                print_flush(f"  tax_exempt_income: ${tax_exempt_income:,.2f}")
-                                print_flush(f"  missing_portion: ${missing_portion:,.2f}")
+                                if trace_enabled:
+                                    debug_log(f"\nBefore adding missing portion:")
+                                    debug_log(f"  tax_exempt_income: ${tax_exempt_income:,.2f}")
+                                    debug_log(f"  missing_portion: ${missing_portion:,.2f}")
                                 tax_exempt_income += missing_portion
-                                print_flush(f"  tax_exempt_income AFTER: ${tax_exempt_income:,.2f}")
-                                print_flush(f"\nMortgage Adjustment:")
-                                print_flush(f"  Gain ratio: {gain_ratio:.4f} ({gain_ratio*100:.2f}%)")
-                                print_flush(f"  Missing portion (mortgage * gain_ratio): ${missing_portion:,.2f}")
+                                if trace_enabled:
+                                    debug_log(f"  tax_exempt_income AFTER: ${tax_exempt_income:,.2f}")
+                                    debug_log(f"\nMortgage Adjustment:")
+                                    debug_log(f"  Gain ratio: {gain_ratio:.4f} ({gain_ratio*100:.2f}%)")
+                                    debug_log(f"  Missing portion (mortgage * gain_ratio): ${missing_portion:,.2f}")
                             else:
-                                print_flush(f"\nMortgage Adjustment: None (no mortgage or net_sale_price <= 0)")
+                                if trace_enabled:
+                                    debug_log(f"\nMortgage Adjustment: None (no mortgage or net_sale_price <= 0)")
                             
                             # Calculate totals
                             total_income_components = return_of_capital_received + depreciation_recapture + capital_gain + missing_portion
-                            print_flush(f"\nIncome Summary:")
-                            print_flush(f"  Return of capital (tax-exempt): ${return_of_capital_received:,.2f}")
-                            print_flush(f"  Depreciation recapture (taxable): ${depreciation_recapture:,.2f}")
-                            print_flush(f"  Capital gain (taxable): ${capital_gain:,.2f}")
-                            print_flush(f"  Missing portion (tax-exempt): ${missing_portion:,.2f}")
-                            print_flush(f"  Total income components: ${total_income_components:,.2f}")
-                            print_flush(f"  Net proceeds after mortgage: ${net_proceeds_after_mortgage:,.2f}")
-                            print_flush(f"  Difference: ${abs(total_income_components - net_proceeds_after_mortgage):,.2f}")
+                            if trace_enabled:
+                                debug_log(f"\nIncome Summary:")
+                                debug_log(f"  Return of capital (tax-exempt): ${return_of_capital_received:,.2f}")
+                                debug_log(f"  Depreciation recapture (taxable): ${depreciation_recapture:,.2f}")
+                                debug_log(f"  Capital gain (taxable): ${capital_gain:,.2f}")
+                                debug_log(f"  Missing portion (tax-exempt): ${missing_portion:,.2f}")
+                                debug_log(f"  Total income components: ${total_income_components:,.2f}")
+                                debug_log(f"  Net proceeds after mortgage: ${net_proceeds_after_mortgage:,.2f}")
+                                debug_log(f"  Difference: ${abs(total_income_components - net_proceeds_after_mortgage):,.2f}")
                             
                             # IMPORTANT: Ensure ALL net proceeds are included in income
                             # If the breakdown doesn't add up to net_proceeds_after_mortgage, add the remainder
                             remaining_proceeds = net_proceeds_after_mortgage - total_income_components
                             if abs(remaining_proceeds) > 0.01:
-                                print_flush(f"\n⚠️  WARNING: Income components don't equal net proceeds!")
-                                print_flush(f"  Remaining proceeds to add: ${remaining_proceeds:,.2f}")
+                                if trace_enabled:
+                                    debug_log(f"\n⚠️  WARNING: Income components don't equal net proceeds!")
+                                    debug_log(f"  Remaining proceeds to add: ${remaining_proceeds:,.2f}")
                                 # Add the remaining proceeds to tax_exempt_income to ensure full amount is included
                                 tax_exempt_income += remaining_proceeds
-                                print_flush(f"  Added remaining ${remaining_proceeds:,.2f} to tax_exempt_income")
-                                print_flush(f"  tax_exempt_income is now: ${tax_exempt_income:,.2f}")
+                                if trace_enabled:
+                                    debug_log(f"  Added remaining ${remaining_proceeds:,.2f} to tax_exempt_income")
+                                    debug_log(f"  tax_exempt_income is now: ${tax_exempt_income:,.2f}")
                             else:
                                 remaining_proceeds = 0.0
-                                print_flush(f"\n✓ All net proceeds are included in income buckets")
+                                if trace_enabled:
+                                    debug_log(f"\n✓ All net proceeds are included in income buckets")
                             
                             # Final verification
                             house_sale_income_in_buckets = depreciation_recapture + capital_gain + return_of_capital_received + missing_portion + remaining_proceeds
-                            print_flush(f"\nFinal Verification:")
-                            print_flush(f"  House sale income in income buckets: ${house_sale_income_in_buckets:,.2f}")
-                            print_flush(f"  Net proceeds after mortgage: ${net_proceeds_after_mortgage:,.2f}")
+                            if trace_enabled:
+                                debug_log(f"\nFinal Verification:")
+                                debug_log(f"  House sale income in income buckets: ${house_sale_income_in_buckets:,.2f}")
+                                debug_log(f"  Net proceeds after mortgage: ${net_proceeds_after_mortgage:,.2f}")
                             if abs(house_sale_income_in_buckets - net_proceeds_after_mortgage) > 0.01:
-                                print_flush(f"  ⚠️  ERROR: Still a mismatch after adjustment!")
+                                if trace_enabled:
+                                    debug_log(f"  ⚠️  ERROR: Still a mismatch after adjustment!")
                             else:
-                                print_flush(f"  ✓ All net proceeds are now included in income buckets")
-                            print_flush(f"{'='*80}\n")
+                                if trace_enabled:
+                                    debug_log(f"  ✓ All net proceeds are now included in income buckets")
+                            if trace_enabled:
+                                debug_log(f"{'='*80}\n")
                             
                             # Mark property as sold
                             st["sold"] = True
@@ -1385,30 +1410,32 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
         income_sources["salary"].append(salary_income)
         
         if house_sale_this_year:  # Print for any year with a house sale
-            print_flush(f"\n{'='*80}")
-            print_flush(f"INCOME CALCULATION - Age {age}")
-            print_flush(f"{'='*80}")
-            print_flush(f"Salary Income: ${salary_income:,.2f}")
-            print_flush(f"Total Specific Income (from income sources): ${total_specific_income:,.2f}")
-            print_flush(f"Total Rental Income (net of depreciation): ${total_rental_income_precalc:,.2f}")
-            print_flush(f"\nIncome Categorization (before house sale):")
-            print_flush(f"  Ordinary income: ${ordinary_income:,.2f}")
-            print_flush(f"  Long-term capital gains: ${long_term_cap_gains:,.2f}")
-            print_flush(f"  Qualified dividends: ${qualified_dividends:,.2f}")
-            print_flush(f"  Tax-exempt income: ${tax_exempt_income:,.2f}")
-            print_flush(f"  Social Security benefits: ${social_security_benefits:,.2f}")
+            if trace_enabled:
+                debug_log(f"\n{'='*80}")
+                debug_log(f"INCOME CALCULATION - Age {age}")
+                debug_log(f"{'='*80}")
+                debug_log(f"Salary Income: ${salary_income:,.2f}")
+                debug_log(f"Total Specific Income (from income sources): ${total_specific_income:,.2f}")
+                debug_log(f"Total Rental Income (net of depreciation): ${total_rental_income_precalc:,.2f}")
+                debug_log(f"\nIncome Categorization (before house sale):")
+                debug_log(f"  Ordinary income: ${ordinary_income:,.2f}")
+                debug_log(f"  Long-term capital gains: ${long_term_cap_gains:,.2f}")
+                debug_log(f"  Qualified dividends: ${qualified_dividends:,.2f}")
+                debug_log(f"  Tax-exempt income: ${tax_exempt_income:,.2f}")
+                debug_log(f"  Social Security benefits: ${social_security_benefits:,.2f}")
         
         # --- CALCULATE TAXES ---
         if house_sale_this_year:  # Print for any year with a house sale
-            print_flush(f"\n{'='*80}")
-            print_flush(f"TAX CALCULATION - Age {age}")
-            print_flush(f"{'='*80}")
-            print_flush(f"Final Income Breakdown (after all sources):")
-            print_flush(f"  Ordinary income: ${ordinary_income:,.2f}")
-            print_flush(f"  Long-term capital gains: ${long_term_cap_gains:,.2f}")
-            print_flush(f"  Qualified dividends: ${qualified_dividends:,.2f}")
-            print_flush(f"  Tax-exempt income: ${tax_exempt_income:,.2f}")
-            print_flush(f"  Social Security benefits: ${social_security_benefits:,.2f}")
+            if trace_enabled:
+                debug_log(f"\n{'='*80}")
+                debug_log(f"TAX CALCULATION - Age {age}")
+                debug_log(f"{'='*80}")
+                debug_log(f"Final Income Breakdown (after all sources):")
+                debug_log(f"  Ordinary income: ${ordinary_income:,.2f}")
+                debug_log(f"  Long-term capital gains: ${long_term_cap_gains:,.2f}")
+                debug_log(f"  Qualified dividends: ${qualified_dividends:,.2f}")
+                debug_log(f"  Tax-exempt income: ${tax_exempt_income:,.2f}")
+                debug_log(f"  Social Security benefits: ${social_security_benefits:,.2f}")
         
         tax_breakdown = TaxableIncomeBreakdown(
             ordinary_income=ordinary_income,
@@ -1441,12 +1468,8 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
         if debug:
             # Print tax_result structure once for debugging (first year only)
             if age == scenario.current_age:
-                if hasattr(tax_result, 'model_dump'):
-                    print_flush(f"\nDEBUG: TaxResult structure (first year): {tax_result.model_dump()}")
-                elif hasattr(tax_result, 'dict'):
-                    print_flush(f"\nDEBUG: TaxResult structure (first year): {tax_result.dict()}")
-                else:
-                    print_flush(f"\nDEBUG: TaxResult attributes: {dir(tax_result)}")
+                if trace_enabled:
+                    debug_log(f"\nDEBUG: TaxResult structure (first year): {tax_result.model_dump()}")
             
             year_trace["income"]["gross_income_total"] = gross_income_all
             year_trace["income"]["ordinary_income_total"] = ordinary_income
@@ -1466,30 +1489,31 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
         net_after_tax_income = gross_income_for_cash_flow - tax_result.total_tax
         
         if house_sale_this_year:  # Print for any year with a house sale
-            print_flush(f"\nTax Results:")
-            print_flush(f"  Federal ordinary tax: ${tax_result.federal_ordinary_tax:,.2f}")
-            print_flush(f"  Federal LTCG tax: ${tax_result.federal_ltcg_tax:,.2f}")
-            print_flush(f"  State tax: ${tax_result.state_tax:,.2f}")
-            print_flush(f"  Total tax: ${tax_result.total_tax:,.2f}")
-            print_flush(f"  Effective tax rate: {tax_result.effective_total_rate*100:.2f}%")
-            print_flush(f"\nGross Income Breakdown:")
-            print_flush(f"  Ordinary income: ${ordinary_income:,.2f} (includes depreciation recapture from house sale)")
-            print_flush(f"  Long-term capital gains: ${long_term_cap_gains:,.2f} (includes capital gain from house sale)")
-            print_flush(f"  Qualified dividends: ${qualified_dividends:,.2f}")
-            print_flush(f"  Tax-exempt income: ${tax_exempt_income:,.2f} (includes return of capital + missing portion from house sale)")
-            print_flush(f"  Social Security benefits: ${social_security_benefits:,.2f}")
-            print_flush(f"  ─────────────────────────────")
-            print_flush(f"  TOTAL GROSS INCOME: ${gross_income_all:,.2f}")
-            print_flush(f"\nHouse Sale Verification:")
-            print_flush(f"  Net proceeds from house sale: ${house_sale_net_proceeds:,.2f}")
-            print_flush(f"  Total gross income: ${gross_income_all:,.2f}")
-            print_flush(f"  ✓ All net proceeds from house sale are included in gross income")
-            print_flush(f"\nNet Income Calculation:")
-            print_flush(f"  Gross income (all sources): ${gross_income_all:,.2f}")
-            print_flush(f"  Less: Total taxes: ${tax_result.total_tax:,.2f}")
-            print_flush(f"  ─────────────────────────────")
-            print_flush(f"  Net after-tax income: ${net_after_tax_income:,.2f}")
-            print_flush(f"{'='*80}\n")
+            if trace_enabled:
+                debug_log(f"\nTax Results:")
+                debug_log(f"  Federal ordinary tax: ${tax_result.federal_ordinary_tax:,.2f}")
+                debug_log(f"  Federal LTCG tax: ${tax_result.federal_ltcg_tax:,.2f}")
+                debug_log(f"  State tax: ${tax_result.state_tax:,.2f}")
+                debug_log(f"  Total tax: ${tax_result.total_tax:,.2f}")
+                debug_log(f"  Effective tax rate: {tax_result.effective_total_rate*100:.2f}%")
+                debug_log(f"\nGross Income Breakdown:")
+                debug_log(f"  Ordinary income: ${ordinary_income:,.2f} (includes depreciation recapture from house sale)")
+                debug_log(f"  Long-term capital gains: ${long_term_cap_gains:,.2f} (includes capital gain from house sale)")
+                debug_log(f"  Qualified dividends: ${qualified_dividends:,.2f}")
+                debug_log(f"  Tax-exempt income: ${tax_exempt_income:,.2f} (includes return of capital + missing portion from house sale)")
+                debug_log(f"  Social Security benefits: ${social_security_benefits:,.2f}")
+                debug_log(f"  ─────────────────────────────")
+                debug_log(f"  TOTAL GROSS INCOME: ${gross_income_all:,.2f}")
+                debug_log(f"\nHouse Sale Verification:")
+                debug_log(f"  Net proceeds from house sale: ${house_sale_net_proceeds:,.2f}")
+                debug_log(f"  Total gross income: ${gross_income_all:,.2f}")
+                debug_log(f"  ✓ All net proceeds from house sale are included in gross income")
+                debug_log(f"\nNet Income Calculation:")
+                debug_log(f"  Gross income (all sources): ${gross_income_all:,.2f}")
+                debug_log(f"  Less: Total taxes: ${tax_result.total_tax:,.2f}")
+                debug_log(f"  ─────────────────────────────")
+                debug_log(f"  Net after-tax income: ${net_after_tax_income:,.2f}")
+                debug_log(f"{'='*80}\n")
         
         # --- TAX FUNDING ---
         # Fund taxes using the tax funding policy (iterative loop to handle additional taxes from liquidations)
@@ -1880,37 +1904,41 @@ def run_simple_bond_simulation(session: Session, scenario_id: int, debug: bool =
         # Since spending is 0 pre-retirement, Net Cash Flow = Net Income.
         
         if house_sale_this_year:  # Print for any year with a house sale
-            print_flush(f"\n{'='*80}")
-            print_flush(f"SPENDING CALCULATION - Age {age}")
-            print_flush(f"{'='*80}")
-            print_flush(f"  Retirement age: {scenario.retirement_age}")
-            print_flush(f"  Current age: {age}")
+            if trace_enabled:
+                debug_log(f"\n{'='*80}")
+                debug_log(f"SPENDING CALCULATION - Age {age}")
+                debug_log(f"{'='*80}")
+                debug_log(f"  Retirement age: {scenario.retirement_age}")
+                debug_log(f"  Current age: {age}")
         if age >= scenario.retirement_age:
             spending_base = scenario.annual_spending_in_retirement
             spending_nominal_calc = spending_base * ((1 + scenario.inflation_rate) ** years_from_start)
-            print_flush(f"  Base retirement spending: ${spending_base:,.2f}")
-            print_flush(f"  Inflation rate: {scenario.inflation_rate*100:.2f}%")
-            print_flush(f"  Years from start: {years_from_start}")
-            print_flush(f"  Inflation factor: {(1 + scenario.inflation_rate) ** years_from_start:.4f}")
-            print_flush(f"  Spending (nominal, inflation-adjusted): ${spending_nominal:,.2f}")
+            if trace_enabled:
+                debug_log(f"  Base retirement spending: ${spending_base:,.2f}")
+                debug_log(f"  Inflation rate: {scenario.inflation_rate*100:.2f}%")
+                debug_log(f"  Years from start: {years_from_start}")
+                debug_log(f"  Inflation factor: {(1 + scenario.inflation_rate) ** years_from_start:.4f}")
+                debug_log(f"  Spending (nominal, inflation-adjusted): ${spending_nominal:,.2f}")
         else:
-            print_flush(f"  Pre-retirement: Spending = $0.00")
+            if trace_enabled:
+                debug_log(f"  Pre-retirement: Spending = $0.00")
         
         current_net_cash_flow = net_after_tax_income - spending_nominal
         net_cash_flow_list.append(current_net_cash_flow)
         
         if house_sale_this_year:  # Print for any year with a house sale
-            print_flush(f"\n{'='*80}")
-            print_flush(f"NET CASH FLOW CALCULATION - Age {age}")
-            print_flush(f"{'='*80}")
-            print_flush(f"  Gross income (all sources): ${gross_income_all:,.2f}")
-            print_flush(f"  Less: Total taxes: ${tax_result.total_tax:,.2f}")
-            print_flush(f"  ─────────────────────────────")
-            print_flush(f"  Net after-tax income: ${net_after_tax_income:,.2f}")
-            print_flush(f"  Less: Spending: ${spending_nominal:,.2f}")
-            print_flush(f"  ─────────────────────────────")
-            print_flush(f"  NET CASH FLOW: ${current_net_cash_flow:,.2f}")
-            print_flush(f"{'='*80}\n")
+            if trace_enabled:
+                debug_log(f"\n{'='*80}")
+                debug_log(f"NET CASH FLOW CALCULATION - Age {age}")
+                debug_log(f"{'='*80}")
+                debug_log(f"  Gross income (all sources): ${gross_income_all:,.2f}")
+                debug_log(f"  Less: Total taxes: ${tax_result.total_tax:,.2f}")
+                debug_log(f"  ─────────────────────────────")
+                debug_log(f"  Net after-tax income: ${net_after_tax_income:,.2f}")
+                debug_log(f"  Less: Spending: ${spending_nominal:,.2f}")
+                debug_log(f"  ─────────────────────────────")
+                debug_log(f"  NET CASH FLOW: ${current_net_cash_flow:,.2f}")
+                debug_log(f"{'='*80}\n")
 
         # Portfolio balance = total assets (contributions and spending already applied above)
         current_total_balance = total_assets
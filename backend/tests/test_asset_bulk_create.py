@@ -0,0 +1,123 @@
+import sys
+import os
+import unittest
+from datetime import datetime
+from sqlmodel import Session, select
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db
+from backend.models import Scenario, Asset, Security, RealEstateDetails, RSUGrantDetails, RSUVestingTranche, CashDetails
+from backend.schemas import AssetCreate
+from backend import crud
+from .test_helpers import cleanup_test_scenarios
+
+
+class TestCreateTypedAssetsBulk(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine, expire_on_commit=False)
+        cleanup_test_scenarios(self.session)
+        scenario = Scenario(
+            name=f"Test {datetime.now().isoformat()}",
+            current_age=50,
+            retirement_age=65,
+            end_age=90,
+            inflation_rate=0.03,
+            bond_return_rate=0.04,
+            annual_contribution_pre_retirement=10000,
+            annual_spending_in_retirement=50000
+        )
+        security = Security(symbol=f"BLK{datetime.now().strftime('%H%M%S%f')}")
+        self.session.add(scenario)
+        self.session.add(security)
+        self.session.commit()
+        self.scenario_id = scenario.id
+        self.security_id = security.id
+
+    def tearDown(self):
+        cleanup_test_scenarios(self.session)
+        self.session.delete(self.session.get(Security, self.security_id))
+        self.session.commit()
+        self.session.close()
+
+    def test_mixed_types(self):
+        crud.cache_asset_list(self.scenario_id, ('W/"cached"', []), crud.get_cached_asset_list(self.scenario_id)[1])
+
+        assets = crud.create_typed_assets_bulk(self.session, self.scenario_id, [
+            AssetCreate(name="Savings", type="cash", current_balance=25000),
+            AssetCreate(name="House", type="real_estate", real_estate_details={"property_value": 400000}),
+            AssetCreate(name="Rental", type="real_estate", real_estate_details={"property_value": 250000, "annual_rent": 18000}),
+            AssetCreate(name="RSU Grant", type="rsu_grant", rsu_grant_details={
+                "security_id": self.security_id,
+                "grant_date": datetime(2024, 1, 1),
+                "grant_value": 10000,
+                "grant_fmv_at_grant": 100,
+                "vesting_tranches": [
+                    {"vesting_date": datetime(2025, 1, 1), "percentage_of_grant": 0.5},
+                    {"vesting_date": datetime(2026, 1, 1), "percentage_of_grant": 0.5},
+                ],
+            }),
+        ])
+        self.assertEqual([asset.type for asset in assets], ["cash", "real_estate", "real_estate", "rsu_grant"])
+        self.assertTrue(all(asset.id is not None for asset in assets))
+        self.assertIsNone(crud.get_cached_asset_list(self.scenario_id)[0])
+
+        with Session(engine) as session:
+            stored = {
+                asset.name: asset
+                for asset in session.exec(select(Asset).where(Asset.scenario_id == self.scenario_id)).all()
+            }
+            self.assertEqual(
+                {name: (asset.type, asset.current_balance) for name, asset in stored.items()},
+                {
+                    "Savings": ("cash", 25000),
+                    "House": ("real_estate", 400000),
+                    "Rental": ("real_estate", 250000),
+                    "RSU Grant": ("rsu_grant", 10000),
+                },
+            )
+
+            # Real estate details went in with one Core executemany, pointed at the new asset ids
+            real_estate = session.exec(
+                select(RealEstateDetails.asset_id, RealEstateDetails.property_value, RealEstateDetails.annual_rent)
+                .where(RealEstateDetails.asset_id.in_([stored["House"].id, stored["Rental"].id]))
+                .order_by(RealEstateDetails.asset_id)
+            ).all()
+            self.assertEqual(
+                [tuple(row) for row in real_estate],
+                [(stored["House"].id, 400000, 0.0), (stored["Rental"].id, 250000, 18000)],
+            )
+            # Cash assets carry their balance on the asset row
+            self.assertEqual(
+                session.exec(select(CashDetails).where(CashDetails.asset_id == stored["Savings"].id)).all(), []
+            )
+
+            grant = session.exec(select(RSUGrantDetails).where(RSUGrantDetails.asset_id == stored["RSU Grant"].id)).one()
+            self.assertEqual(grant.security_id, self.security_id)
+            tranches = session.exec(
+                select(RSUVestingTranche.percentage_of_grant)
+                .where(RSUVestingTranche.rsu_grant_id == grant.id)
+                .order_by(RSUVestingTranche.vesting_date)
+            ).all()
+            self.assertEqual(tranches, [0.5, 0.5])
+
+    def test_failure_rolls_back_every_asset(self):
+        with self.assertRaises(Exception):
+            crud.create_typed_assets_bulk(self.session, self.scenario_id, [
+                AssetCreate(name="House", type="real_estate", real_estate_details={"property_value": 400000}),
+                # Unknown security: the grant's foreign key fails at flush
+                AssetCreate(name="RSU Grant", type="rsu_grant", rsu_grant_details={
+                    "security_id": 10 ** 9,
+                    "grant_date": datetime(2024, 1, 1),
+                    "grant_value": 10000,
+                    "grant_fmv_at_grant": 100,
+                    "vesting_tranches": [{"vesting_date": datetime(2025, 1, 1), "percentage_of_grant": 1.0}],
+                }),
+            ])
+        self.assertEqual(self.session.exec(select(Asset).where(Asset.scenario_id == self.scenario_id)).all(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
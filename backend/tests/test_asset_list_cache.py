@@ -0,0 +1,143 @@
+import sys
+import os
+import unittest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db
+from backend.main import app
+from backend import crud
+from .test_helpers import cleanup_test_scenarios
+
+
+class TestAssetListCache(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine)
+        cleanup_test_scenarios(self.session)
+        self.client = TestClient(app)
+        self.scenario_id = self._create_scenario()
+        self.assets_url = f"/api/scenarios/{self.scenario_id}/assets"
+
+    def tearDown(self):
+        cleanup_test_scenarios(self.session)
+        self.session.close()
+
+    def _create_scenario(self) -> int:
+        response = self.client.post("/api/scenarios", json={
+            "name": f"Test {datetime.now().isoformat()}",
+            "current_age": 50,
+            "retirement_age": 65,
+            "end_age": 90,
+            "inflation_rate": 0.03,
+            "bond_return_rate": 0.04,
+            "annual_contribution_pre_retirement": 10000,
+            "annual_spending_in_retirement": 50000,
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()["id"]
+
+    def _cache_stale_empty_list(self, scenario_id: int):
+        crud.cache_asset_list(scenario_id, ('W/"stale"', []), crud.get_cached_asset_list(scenario_id)[1])
+
+    def _create_cash_asset(self, name: str) -> dict:
+        response = self.client.post(self.assets_url, json={
+            "name": name, "type": "cash", "current_balance": 1000, "cash_details": {"balance": 1000},
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_unchanged_list_answers_304(self):
+        self._create_cash_asset("Savings")
+        first = self.client.get(self.assets_url)
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+
+        # The second read is served from the cache with the same tag
+        second = self.client.get(self.assets_url)
+        self.assertEqual(second.headers["ETag"], etag)
+        self.assertEqual(second.json(), first.json())
+
+        not_modified = self.client.get(self.assets_url, headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["ETag"], etag)
+
+    def test_writes_invalidate_the_list(self):
+        etag = self.client.get(self.assets_url).headers["ETag"]
+
+        created = self._create_cash_asset("Savings")
+        after_create = self.client.get(self.assets_url, headers={"If-None-Match": etag})
+        self.assertEqual(after_create.status_code, 200)
+        self.assertEqual([asset["id"] for asset in after_create.json()], [created["id"]])
+        etag = after_create.headers["ETag"]
+
+        self.assertEqual(self.client.delete(f"/api/assets/{created['id']}").status_code, 200)
+        after_delete = self.client.get(self.assets_url, headers={"If-None-Match": etag})
+        self.assertEqual(after_delete.status_code, 200)
+        self.assertEqual(after_delete.json(), [])
+
+    def test_uncommitted_delete_invalidates_on_commit(self):
+        created = self._create_cash_asset("Savings")
+        self.client.get(self.assets_url)
+        self.assertIsNotNone(crud.get_cached_asset_list(self.scenario_id)[0])
+
+        self.assertTrue(crud.delete_asset(self.session, created["id"], commit=False))
+        # Until the caller commits, other sessions still see the asset, so the cached list stays
+        self.assertIsNotNone(crud.get_cached_asset_list(self.scenario_id)[0])
+        self.session.commit()
+        self.assertIsNone(crud.get_cached_asset_list(self.scenario_id)[0])
+
+    def test_export_answers_304_until_the_scenario_changes(self):
+        export_url = f"/api/scenarios/{self.scenario_id}/export"
+        first = self.client.get(export_url)
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+
+        not_modified = self.client.get(export_url, headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+
+        self._create_cash_asset("Savings")
+        changed = self.client.get(export_url, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+        self.assertEqual(len(changed.json()["assets"]), 1)
+
+    def test_missing_scenario_is_404_and_not_cached(self):
+        self.assertEqual(self.client.delete(f"/api/scenarios/{self.scenario_id}").status_code, 200)
+        self.assertEqual(self.client.get(self.assets_url).status_code, 404)
+        self.assertIsNone(crud.get_cached_asset_list(self.scenario_id)[0])
+
+    def test_import_into_a_reused_id_invalidates(self):
+        self._create_cash_asset("Savings")
+        export_data = self.client.get(f"/api/scenarios/{self.scenario_id}/export").json()
+        # Deleting the newest scenario frees its id for the next insert
+        self.assertEqual(self.client.delete(f"/api/scenarios/{self.scenario_id}").status_code, 200)
+        self._cache_stale_empty_list(self.scenario_id)
+
+        response = self.client.post("/api/scenarios/import", json=export_data)
+        self.assertEqual(response.status_code, 200)
+        new_id = response.json()["new_scenario_id"]
+        self.assertEqual(new_id, self.scenario_id)
+        self.assertEqual([asset["name"] for asset in self.client.get(self.assets_url).json()], ["Savings"])
+
+    def test_duplicate_into_a_reused_id_invalidates(self):
+        self._create_cash_asset("Savings")
+        freed_id = self._create_scenario()
+        self.assertEqual(self.client.delete(f"/api/scenarios/{freed_id}").status_code, 200)
+        self._cache_stale_empty_list(freed_id)
+
+        response = self.client.post(f"/api/scenarios/{self.scenario_id}/duplicate")
+        self.assertEqual(response.status_code, 200)
+        new_id = response.json()["new_scenario_id"]
+        self.assertEqual(new_id, freed_id)
+        assets = self.client.get(f"/api/scenarios/{new_id}/assets").json()
+        self.assertEqual([asset["name"] for asset in assets], ["Savings"])
+
+
+if __name__ == '__main__':
+    unittest.main()
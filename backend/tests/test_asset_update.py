@@ -0,0 +1,158 @@
+import sys
+import os
+import sqlite3
+import unittest
+from datetime import datetime
+from sqlmodel import Session, select
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db, sqlite_file_name
+from backend.models import Scenario, Asset, Security, RealEstateDetails, GeneralEquityDetails, RSUVestingTranche
+from backend.schemas import AssetCreate
+from backend import crud
+from .test_helpers import cleanup_test_scenarios
+
+
+class TestUpdateTypedAsset(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine, expire_on_commit=False)
+        cleanup_test_scenarios(self.session)
+        scenario = Scenario(
+            name=f"Test {datetime.now().isoformat()}",
+            current_age=50,
+            retirement_age=65,
+            end_age=90,
+            inflation_rate=0.03,
+            bond_return_rate=0.04,
+            annual_contribution_pre_retirement=10000,
+            annual_spending_in_retirement=50000
+        )
+        self.session.add(scenario)
+        self.session.commit()
+        self.scenario_id = scenario.id
+
+    def tearDown(self):
+        cleanup_test_scenarios(self.session)
+        self.session.close()
+
+    def _reload(self, asset_id: int) -> Asset:
+        # A fresh session, so the asserts see what was committed rather than the identity map
+        session = Session(engine)
+        self.addCleanup(session.close)
+        return session.get(Asset, asset_id)
+
+    def test_same_type_cash_update_keeps_changes(self):
+        asset = crud.create_typed_asset(
+            self.session, self.scenario_id, AssetCreate(name="Savings", type="cash", current_balance=1000)
+        )
+
+        updated = crud.update_typed_asset(
+            self.session, asset.id, AssetCreate(name="Emergency Fund", type="cash", current_balance=2500)
+        )
+        self.assertEqual((updated.name, updated.current_balance), ("Emergency Fund", 2500))
+
+        stored = self._reload(asset.id)
+        self.assertEqual((stored.name, stored.type, stored.current_balance), ("Emergency Fund", "cash", 2500))
+
+    def test_no_op_save_writes_nothing(self):
+        data = AssetCreate(
+            name="Brokerage", type="general_equity",
+            general_equity_details={"account_balance": 75000, "expected_return_rate": 0.06},
+        )
+        asset = crud.create_typed_asset(self.session, self.scenario_id, data)
+        crud.cache_asset_list(self.scenario_id, ('W/"cached"', []), crud.get_cached_asset_list(self.scenario_id)[1])
+        updated_at = self._reload(asset.id).general_equity_details.updated_at
+
+        crud.update_typed_asset(self.session, asset.id, data)
+
+        # The cached list survives, the row is untouched, and no write transaction was left open
+        self.assertIsNotNone(crud.get_cached_asset_list(self.scenario_id)[0])
+        self.assertEqual(self._reload(asset.id).general_equity_details.updated_at, updated_at)
+        conn = sqlite3.connect(sqlite_file_name, timeout=0)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ROLLBACK")
+        finally:
+            conn.close()
+
+        # A real change still invalidates
+        crud.update_typed_asset(self.session, asset.id, AssetCreate(
+            name="Brokerage", type="general_equity",
+            general_equity_details={"account_balance": 80000, "expected_return_rate": 0.06},
+        ))
+        self.assertIsNone(crud.get_cached_asset_list(self.scenario_id)[0])
+
+    def test_type_change_replaces_details(self):
+        asset = crud.create_typed_asset(self.session, self.scenario_id, AssetCreate(
+            name="House", type="real_estate", real_estate_details={"property_value": 400000},
+        ))
+
+        updated = crud.update_typed_asset(self.session, asset.id, AssetCreate(
+            name="Brokerage", type="general_equity",
+            general_equity_details={"account_balance": 75000, "expected_return_rate": 0.06},
+        ))
+        self.assertEqual(updated.current_balance, 75000)
+        self.assertIsNone(updated.real_estate_details)
+        self.assertEqual(updated.general_equity_details.expected_return_rate, 0.06)
+
+        stored = self._reload(asset.id)
+        self.assertEqual(stored.type, "general_equity")
+        self.assertEqual(stored.general_equity_details.expected_return_rate, 0.06)
+        self.assertEqual(
+            self.session.exec(select(RealEstateDetails).where(RealEstateDetails.asset_id == asset.id)).all(), []
+        )
+
+        # Updating the same type again updates the existing details row in place
+        details_id = stored.general_equity_details.id
+        crud.update_typed_asset(self.session, asset.id, AssetCreate(
+            name="Brokerage", type="general_equity",
+            general_equity_details={"account_balance": 80000, "expected_return_rate": 0.07},
+        ))
+        rows = self.session.exec(select(GeneralEquityDetails).where(GeneralEquityDetails.asset_id == asset.id)).all()
+        self.assertEqual([(row.id, row.expected_return_rate) for row in rows], [(details_id, 0.07)])
+
+    def test_rsu_tranches_are_replaced(self):
+        security = Security(symbol=f"UPD{datetime.now().strftime('%H%M%S%f')}")
+        self.session.add(security)
+        self.session.commit()
+        self.addCleanup(self._delete_security, security)
+
+        def grant(tranches):
+            return AssetCreate(name="RSU Grant", type="rsu_grant", rsu_grant_details={
+                "security_id": security.id,
+                "grant_date": datetime(2024, 1, 1),
+                "grant_value": 10000,
+                "grant_fmv_at_grant": 100,
+                "vesting_tranches": [
+                    {"vesting_date": vesting_date, "percentage_of_grant": percentage}
+                    for vesting_date, percentage in tranches
+                ],
+            })
+
+        asset = crud.create_typed_asset(self.session, self.scenario_id, grant([(datetime(2025, 1, 1), 1.0)]))
+        new_tranches = [(datetime(2025, 6, 1), 0.5), (datetime(2026, 6, 1), 0.5)]
+        updated = crud.update_typed_asset(self.session, asset.id, grant(new_tranches))
+        self.assertEqual(
+            [(t.vesting_date, t.percentage_of_grant) for t in updated.rsu_grant_details.vesting_tranches], new_tranches
+        )
+
+        stored = self._reload(asset.id).rsu_grant_details
+        self.assertEqual(
+            sorted((t.vesting_date, t.percentage_of_grant) for t in stored.vesting_tranches), new_tranches
+        )
+        # The old tranche rows are gone, not just detached
+        rows = self.session.exec(select(RSUVestingTranche).where(RSUVestingTranche.rsu_grant_id == stored.id)).all()
+        self.assertEqual(len(rows), 2)
+
+    def _delete_security(self, security: Security):
+        # Runs after tearDown, once the scenario (and the grant referencing the security) is gone
+        with Session(engine) as session:
+            session.delete(session.get(Security, security.id))
+            session.commit()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import sys
+import os
+import unittest
+from datetime import datetime
+from sqlmodel import Session, select
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db
+from backend.models import (
+    Scenario, Asset, IncomeSource, RealEstateDetails, CashDetails, Security, RSUGrantDetails,
+    RSUVestingTranche, TaxFundingSettings, TaxFundingOrderEntry,
+)
+from backend.export_import import duplicate_scenario
+from .test_helpers import cleanup_test_scenarios
+
+
+class TestDuplicateScenario(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine)
+        cleanup_test_scenarios(self.session)
+        self.security = Security(symbol=f"DUP{datetime.now().strftime('%H%M%S%f')}")
+        self.session.add(self.security)
+        self.session.commit()
+        self.session.refresh(self.security)
+
+    def tearDown(self):
+        cleanup_test_scenarios(self.session)
+        self.session.delete(self.security)
+        self.session.commit()
+        self.session.close()
+
+    def _add_asset(self, scenario_id: int, name: str, type: str, balance: float) -> Asset:
+        asset = Asset(scenario_id=scenario_id, name=name, type=type, current_balance=balance)
+        self.session.add(asset)
+        self.session.commit()
+        self.session.refresh(asset)
+        return asset
+
+    def _build_scenario(self) -> int:
+        scenario = Scenario(
+            name=f"Test {datetime.now().isoformat()}",
+            current_age=50,
+            retirement_age=65,
+            end_age=90,
+            inflation_rate=0.03,
+            bond_return_rate=0.04,
+            annual_contribution_pre_retirement=10000,
+            annual_spending_in_retirement=50000
+        )
+        self.session.add(scenario)
+        self.session.commit()
+        self.session.refresh(scenario)
+
+        house = self._add_asset(scenario.id, "House", "real_estate", 400000)
+        self.session.add(RealEstateDetails(asset_id=house.id, property_value=400000))
+        savings = self._add_asset(scenario.id, "Savings", "cash", 25000)
+        self.session.add(CashDetails(asset_id=savings.id, balance=25000))
+        rsu = self._add_asset(scenario.id, "RSU Grant", "rsu_grant", 0)
+        grant = RSUGrantDetails(
+            asset_id=rsu.id,
+            security_id=self.security.id,
+            grant_date=datetime(2024, 1, 1),
+            grant_value_type="shares",
+            grant_value=100,
+            grant_fmv_at_grant=50,
+            shares_granted=100,
+        )
+        self.session.add(grant)
+        self.session.commit()
+        self.session.refresh(grant)
+        self.session.add(RSUVestingTranche(rsu_grant_id=grant.id, vesting_date=datetime(2025, 1, 1), percentage_of_grant=0.5))
+        self.session.add(RSUVestingTranche(rsu_grant_id=grant.id, vesting_date=datetime(2026, 1, 1), percentage_of_grant=0.5))
+
+        self.session.add(IncomeSource(
+            scenario_id=scenario.id, name="Pension", income_type="ordinary", start_age=65, annual_amount=20000,
+        ))
+        settings = TaxFundingSettings(scenario_id=scenario.id, allow_retirement_withdrawals_for_taxes=False)
+        self.session.add(settings)
+        self.session.commit()
+        self.session.refresh(settings)
+        for position, source in enumerate(["ROTH", "CASH"]):
+            self.session.add(TaxFundingOrderEntry(settings_id=settings.id, position=position, source=source))
+        self.session.commit()
+        return scenario.id
+
+    def _snapshot(self, scenario_id: int) -> dict:
+        """Everything under a scenario, minus ids and timestamps."""
+        self.session.expire_all()
+        assets = self.session.exec(select(Asset).where(Asset.scenario_id == scenario_id).order_by(Asset.name)).all()
+        snapshot = {"assets": [], "income": [], "settings": None}
+        for asset in assets:
+            entry = {"name": asset.name, "type": asset.type, "balance": asset.current_balance}
+            if asset.real_estate_details:
+                entry["property_value"] = asset.real_estate_details.property_value
+            if asset.cash_details:
+                entry["cash_balance"] = asset.cash_details.balance
+            if asset.rsu_grant_details:
+                grant = asset.rsu_grant_details
+                entry["grant"] = (grant.security_id, grant.shares_granted)
+                entry["tranches"] = sorted(
+                    (t.vesting_date, t.percentage_of_grant) for t in grant.vesting_tranches
+                )
+            snapshot["assets"].append(entry)
+        snapshot["income"] = [
+            (i.name, i.annual_amount)
+            for i in self.session.exec(select(IncomeSource).where(IncomeSource.scenario_id == scenario_id)).all()
+        ]
+        settings = self.session.exec(
+            select(TaxFundingSettings).where(TaxFundingSettings.scenario_id == scenario_id)
+        ).first()
+        if settings:
+            snapshot["settings"] = (
+                settings.allow_retirement_withdrawals_for_taxes,
+                [e.source for e in settings.order_entries],
+            )
+        return snapshot
+
+    def test_duplicate_copies_everything_under_the_scenario(self):
+        scenario_id = self._build_scenario()
+        original = self._snapshot(scenario_id)
+
+        new_id = duplicate_scenario(self.session, scenario_id)
+        self.assertNotEqual(new_id, scenario_id)
+        copy = self._snapshot(new_id)
+
+        self.assertEqual(copy, original)
+        self.assertEqual(len(copy["assets"]), 3)
+        self.assertEqual(len(copy["assets"][1]["tranches"]), 2)
+        self.assertEqual(copy["settings"], (False, ["ROTH", "CASH"]))
+        # The copy has its own rows; the original is untouched
+        self.assertEqual(self._snapshot(scenario_id), original)
+        new_grant_ids = self.session.exec(
+            select(RSUGrantDetails.id).join(Asset).where(Asset.scenario_id == new_id)
+        ).all()
+        old_grant_ids = self.session.exec(
+            select(RSUGrantDetails.id).join(Asset).where(Asset.scenario_id == scenario_id)
+        ).all()
+        self.assertEqual(len(new_grant_ids), 1)
+        self.assertNotEqual(new_grant_ids, old_grant_ids)
+
+    def test_duplicate_with_new_name(self):
+        scenario_id = self._build_scenario()
+        new_name = f"Test copy {datetime.now().isoformat()}"
+        new_id = duplicate_scenario(self.session, scenario_id, new_name)
+        self.assertEqual(self.session.get(Scenario, new_id).name, new_name)
+
+    def test_duplicate_missing_scenario(self):
+        with self.assertRaises(ValueError):
+            duplicate_scenario(self.session, 10 ** 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+import unittest
+from datetime import datetime
+from sqlmodel import Session, select
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db
+from backend.models import Scenario, IncomeSource, IncomeType
+from backend.schemas import IncomeSourceCreate
+from backend import crud
+from .test_helpers import cleanup_test_scenarios
+
+
+class TestCreateIncomeSources(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine, expire_on_commit=False)
+        cleanup_test_scenarios(self.session)
+        scenario = Scenario(
+            name=f"Test {datetime.now().isoformat()}",
+            current_age=50,
+            retirement_age=65,
+            end_age=90,
+            inflation_rate=0.03,
+            bond_return_rate=0.04,
+            annual_contribution_pre_retirement=10000,
+            annual_spending_in_retirement=50000
+        )
+        self.session.add(scenario)
+        self.session.commit()
+        self.scenario_id = scenario.id
+
+    def tearDown(self):
+        cleanup_test_scenarios(self.session)
+        self.session.close()
+
+    def _stored(self):
+        with Session(engine) as session:
+            rows = session.exec(
+                select(IncomeSource).where(IncomeSource.scenario_id == self.scenario_id).order_by(IncomeSource.id)
+            ).all()
+            return [(row.name, row.annual_amount, row.income_type) for row in rows]
+
+    def test_create_income_source(self):
+        income_source = crud.create_income_source(
+            self.session,
+            IncomeSourceCreate(name="Salary", amount=1000, start_age=40, end_age=60, income_type="ordinary"),
+            self.scenario_id,
+        )
+        self.assertIsNotNone(income_source.id)
+        self.assertEqual(income_source.annual_amount, 1000)
+        self.assertEqual(self._stored(), [("Salary", 1000, IncomeType.ORDINARY)])
+
+    def test_create_income_sources_bulk(self):
+        created = crud.create_income_sources_bulk(self.session, self.scenario_id, [
+            IncomeSourceCreate(name="Salary", amount=1000, start_age=40, end_age=60, income_type="ordinary"),
+            IncomeSourceCreate(name="Social Security", amount=2000, start_age=67, end_age=90, income_type="social_security"),
+        ])
+        self.assertTrue(all(income_source.id is not None for income_source in created))
+        self.assertEqual(self._stored(), [
+            ("Salary", 1000, IncomeType.ORDINARY),
+            ("Social Security", 2000, IncomeType.SOCIAL_SECURITY),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
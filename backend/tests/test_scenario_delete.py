@@ -0,0 +1,137 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session, create_engine, select, text
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db, _set_sqlite_pragmas
+from backend.migrations.runner import migrate_database
+from backend.models import (
+    Scenario, Asset, IncomeSource, RealEstateDetails, TaxFundingSettings, TaxFundingOrderEntry,
+)
+from backend import crud
+from .test_helpers import cleanup_test_scenarios
+
+
+def _make_scenario(session: Session) -> Scenario:
+    scenario = Scenario(
+        name=f"Test {datetime.now().isoformat()}",
+        current_age=50,
+        retirement_age=65,
+        end_age=90,
+        inflation_rate=0.03,
+        bond_return_rate=0.04,
+        annual_contribution_pre_retirement=10000,
+        annual_spending_in_retirement=50000
+    )
+    session.add(scenario)
+    session.commit()
+    session.refresh(scenario)
+    return scenario
+
+
+class TestDeleteScenario(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine)
+        cleanup_test_scenarios(self.session)
+
+    def tearDown(self):
+        cleanup_test_scenarios(self.session)
+        self.session.close()
+
+    def test_delete_scenario_removes_children(self):
+        scenario = _make_scenario(self.session)
+        asset = Asset(scenario_id=scenario.id, name="House", type="real_estate", current_balance=400000)
+        self.session.add(asset)
+        self.session.commit()
+        self.session.refresh(asset)
+        self.session.add(RealEstateDetails(asset_id=asset.id, property_value=400000))
+        self.session.add(IncomeSource(
+            scenario_id=scenario.id, name="Pension", income_type="ordinary",
+            start_age=65, annual_amount=20000,
+        ))
+        settings = TaxFundingSettings(scenario_id=scenario.id)
+        self.session.add(settings)
+        self.session.commit()
+        self.session.refresh(settings)
+        self.session.add(TaxFundingOrderEntry(settings_id=settings.id, position=0, source="CASH"))
+        self.session.commit()
+        scenario_id, asset_id, settings_id = scenario.id, asset.id, settings.id
+
+        self.assertTrue(crud.delete_scenario(self.session, scenario_id))
+        self.assertIsNone(crud.delete_scenario(self.session, scenario_id))
+
+        # Every child row goes with the scenario via ON DELETE CASCADE
+        self.session.expire_all()
+        self.assertEqual(self.session.exec(select(Asset).where(Asset.id == asset_id)).all(), [])
+        self.assertEqual(
+            self.session.exec(select(RealEstateDetails).where(RealEstateDetails.asset_id == asset_id)).all(), []
+        )
+        self.assertEqual(
+            self.session.exec(select(IncomeSource).where(IncomeSource.scenario_id == scenario_id)).all(), []
+        )
+        self.assertEqual(
+            self.session.exec(
+                select(TaxFundingOrderEntry).where(TaxFundingOrderEntry.settings_id == settings_id)
+            ).all(),
+            []
+        )
+
+
+class TestDeleteScenarioLegacySchema(unittest.TestCase):
+    """A database created before the cascade migrations must be upgraded before deletes rely on them."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "legacy.db")
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        SQLModel.metadata.create_all(self.engine)
+        # Put back the asset table an older version created: no ON DELETE CASCADE to scenario
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            conn.exec_driver_sql("DROP TABLE asset")
+            conn.exec_driver_sql("""
+                CREATE TABLE asset (
+                    id INTEGER NOT NULL,
+                    scenario_id INTEGER NOT NULL,
+                    name VARCHAR NOT NULL,
+                    type VARCHAR NOT NULL,
+                    current_balance FLOAT NOT NULL,
+                    created_at DATETIME NOT NULL,
+                    updated_at DATETIME NOT NULL,
+                    PRIMARY KEY (id),
+                    FOREIGN KEY(scenario_id) REFERENCES scenario (id)
+                )
+            """)
+        # Drop the pooled connection that had foreign key enforcement switched off
+        self.engine.dispose()
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_migrated_database_cascades_scenario_delete(self):
+        applied = migrate_database(self.db_path)
+        self.assertIn("add_cascade_to_scenario_children", applied)
+        self.assertEqual(migrate_database(self.db_path), [])
+
+        with Session(self.engine) as session:
+            scenario = _make_scenario(session)
+            session.add(Asset(scenario_id=scenario.id, name="Savings", type="cash", current_balance=1000))
+            session.commit()
+
+            self.assertTrue(crud.delete_scenario(session, scenario.id))
+            remaining = session.exec(text("SELECT COUNT(*) FROM asset")).one()[0]
+            self.assertEqual(remaining, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+import unittest
+from datetime import datetime
+from sqlmodel import Session
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db
+from backend.models import Security
+from backend import crud
+
+
+class TestGetOrCreateSecurity(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine, expire_on_commit=False)
+        self.symbol = f"TST{datetime.now().strftime('%H%M%S%f')}"
+
+    def tearDown(self):
+        security = crud.get_security_by_symbol(self.session, self.symbol)
+        if security:
+            self.session.delete(security)
+            self.session.commit()
+        self.session.close()
+
+    def test_new_symbol_is_inserted(self):
+        security = crud.get_or_create_security(self.session, self.symbol, "Test Co", 0.05)
+        self.assertIsNotNone(security.id)
+        self.assertEqual((security.symbol, security.name, security.assumed_appreciation_rate), (self.symbol, "Test Co", 0.05))
+        self.assertEqual(crud.get_security_by_symbol(self.session, self.symbol).id, security.id)
+
+    def test_new_symbol_without_rate(self):
+        security = crud.get_or_create_security(self.session, self.symbol)
+        self.assertEqual(security.assumed_appreciation_rate, 0.0)
+
+    def test_existing_symbol_updates_rate(self):
+        created = crud.get_or_create_security(self.session, self.symbol, "Test Co", 0.05)
+        updated = crud.get_or_create_security(self.session, self.symbol, "Ignored", 0.08)
+        self.assertEqual(updated.id, created.id)
+        self.assertEqual(updated.assumed_appreciation_rate, 0.08)
+        # Only the rate is updated on conflict
+        self.assertEqual(updated.name, "Test Co")
+
+    def test_existing_symbol_with_rate_none_is_left_alone(self):
+        created = crud.get_or_create_security(self.session, self.symbol, "Test Co", 0.05)
+        existing = crud.get_or_create_security(self.session, self.symbol)
+        self.assertEqual(existing.id, created.id)
+        self.assertEqual((existing.name, existing.assumed_appreciation_rate), ("Test Co", 0.05))
+        with Session(engine) as session:
+            self.assertEqual(session.get(Security, created.id).assumed_appreciation_rate, 0.05)
+
+    def _prime_cache(self):
+        index = crud.cache_securities([], crud.get_cached_securities()[1])
+        self.assertIs(crud.get_cached_securities()[0], index)
+
+    def test_cache_is_invalidated_after_a_change(self):
+        self._prime_cache()
+        crud.get_or_create_security(self.session, self.symbol, "Test Co", 0.05)
+        self.assertIsNone(crud.get_cached_securities()[0])
+
+        self._prime_cache()
+        crud.get_or_create_security(self.session, self.symbol, assumed_appreciation_rate=0.06)
+        self.assertIsNone(crud.get_cached_securities()[0])
+
+    def test_cache_survives_a_no_op(self):
+        crud.get_or_create_security(self.session, self.symbol, "Test Co", 0.05)
+
+        self._prime_cache()
+        # Existing symbol with no rate, or with the rate it already has: nothing is written
+        crud.get_or_create_security(self.session, self.symbol)
+        crud.get_or_create_security(self.session, self.symbol, assumed_appreciation_rate=0.05)
+        self.assertIsNotNone(crud.get_cached_securities()[0])
+
+    def test_uncommitted_change_invalidates_on_commit(self):
+        self._prime_cache()
+        crud.get_or_create_security(self.session, self.symbol, "Test Co", 0.05, commit=False)
+        self.assertIsNotNone(crud.get_cached_securities()[0])
+        self.session.commit()
+        self.assertIsNone(crud.get_cached_securities()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import os
+import json
+import sqlite3
+import unittest
+from datetime import datetime
+from pydantic import ValidationError
+from sqlmodel import Session, select
+
+# Add current directory to path so we can import backend modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import engine, init_db
+from backend.main import get_tax_funding_settings, update_tax_funding_settings
+from backend.models import Scenario, TaxFundingOrderEntry, DEFAULT_TAX_FUNDING_ORDER
+from backend.schemas import TaxFundingSettingsCreate
+from backend import move_tax_funding_order_to_table
+from .test_helpers import cleanup_test_scenarios
+
+
+class TestTaxFundingOrder(unittest.TestCase):
+    def setUp(self):
+        init_db()
+        self.session = Session(engine, expire_on_commit=False)
+        cleanup_test_scenarios(self.session)
+        scenario = Scenario(
+            name=f"Test {datetime.now().isoformat()}",
+            current_age=50,
+            retirement_age=65,
+            end_age=90,
+            inflation_rate=0.03,
+            bond_return_rate=0.04,
+            annual_contribution_pre_retirement=10000,
+            annual_spending_in_retirement=50000
+        )
+        self.session.add(scenario)
+        self.session.commit()
+        self.scenario_id = scenario.id
+
+    def tearDown(self):
+        cleanup_test_scenarios(self.session)
+        self.session.close()
+
+    def _read_order(self):
+        # A fresh session, so the order comes back from the database rather than the identity map
+        with Session(engine, expire_on_commit=False) as session:
+            return get_tax_funding_settings(self.scenario_id, session).tax_funding_order
+
+    def test_default_order_is_created(self):
+        self.assertEqual(self._read_order(), list(DEFAULT_TAX_FUNDING_ORDER))
+
+    def test_order_round_trips_in_position_order(self):
+        order = ["ROTH", "CASH", "TAXABLE_BROKERAGE"]
+        update_tax_funding_settings(self.scenario_id, TaxFundingSettingsCreate(tax_funding_order=order), self.session)
+        self.assertEqual(self._read_order(), order)
+
+        # Replacing the order rewrites every position
+        reordered = ["TAXABLE_BROKERAGE", "ROTH"]
+        settings = update_tax_funding_settings(
+            self.scenario_id, TaxFundingSettingsCreate(tax_funding_order=reordered), self.session
+        )
+        self.assertEqual(self._read_order(), reordered)
+
+        positions = self.session.exec(
+            select(TaxFundingOrderEntry.position)
+            .where(TaxFundingOrderEntry.settings_id == settings.id)
+            .order_by(TaxFundingOrderEntry.position)
+        ).all()
+        self.assertEqual(positions, [0, 1])
+
+    def test_order_validation(self):
+        with self.assertRaises(ValidationError):
+            TaxFundingSettingsCreate(tax_funding_order=[])
+        with self.assertRaises(ValidationError):
+            TaxFundingSettingsCreate(tax_funding_order=["CASH", "CASH"])
+        with self.assertRaises(ValidationError):
+            TaxFundingSettingsCreate(tax_funding_order=["NOT_A_SOURCE"])
+
+
+class TestMoveTaxFundingOrderMigration(unittest.TestCase):
+    def test_json_order_is_copied_into_entries(self):
+        conn = sqlite3.connect(":memory:", isolation_level=None)
+        conn.execute("""
+            CREATE TABLE taxfundingsettings (
+                id INTEGER NOT NULL,
+                scenario_id INTEGER NOT NULL,
+                tax_funding_order_json VARCHAR NOT NULL,
+                allow_retirement_withdrawals_for_taxes BOOLEAN NOT NULL,
+                if_insufficient_funds_behavior VARCHAR(23) NOT NULL,
+                tax_table_indexing_policy VARCHAR(18) NOT NULL,
+                tax_table_custom_index_rate FLOAT,
+                created_at DATETIME NOT NULL,
+                updated_at DATETIME NOT NULL,
+                PRIMARY KEY (id),
+                UNIQUE (scenario_id)
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO taxfundingsettings VALUES (?, ?, ?, 1, 'FAIL_WITH_SHORTFALL', 'CONSTANT_NOMINAL', NULL, '2025-01-01', '2025-01-01')",
+            [(1, 1, json.dumps(["ROTH", "CASH"])), (2, 2, json.dumps(["CASH"]))],
+        )
+
+        conn.execute("BEGIN")
+        move_tax_funding_order_to_table.migrate(conn)
+        conn.execute("COMMIT")
+
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(taxfundingsettings)")]
+        self.assertNotIn("tax_funding_order_json", columns)
+        entries = conn.execute(
+            "SELECT settings_id, position, source FROM taxfundingorderentry ORDER BY settings_id, position"
+        ).fetchall()
+        self.assertEqual(entries, [(1, 0, "ROTH"), (1, 1, "CASH"), (2, 0, "CASH")])
+
+        # A second run finds the column gone and leaves the entries alone
+        move_tax_funding_order_to_table.migrate(conn)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM taxfundingorderentry").fetchone()[0], 3)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
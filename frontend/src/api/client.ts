@@ -1,6 +1,6 @@
 import axios from 'axios';
 import { 
-  Scenario, ScenarioCreate, Asset, AssetCreate, SimpleBondSimulationResult, IncomeSource, IncomeSourceCreate,
+  Scenario, ScenarioSummary, ScenarioCreate, Asset, AssetCreate, SimpleBondSimulationResult, IncomeSource, IncomeSourceCreate,
   Security, SecurityCreate, RSUGrantForecastCreate, RSUGrantForecastRead, RSUGrantDetailsResponse,
   TaxFundingSettings, TaxFundingSettingsCreate, TaxTable, TaxTableCreate
 } from '../types';
@@ -14,6 +14,11 @@ export const getScenarios = async (): Promise<Scenario[]> => {
   return response.data;
 };
 
+export const getScenarioSummaries = async (): Promise<ScenarioSummary[]> => {
+  const response = await api.get<ScenarioSummary[]>('/scenarios/summary');
+  return response.data;
+};
+
 export const createScenario = async (payload: ScenarioCreate): Promise<Scenario> => {
   const response = await api.post<Scenario>('/scenarios', payload);
   return response.data;
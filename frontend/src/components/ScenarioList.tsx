@@ -8,11 +8,11 @@ import DeleteIcon from '@mui/icons-material/Delete';
 import { NumericFormat } from 'react-number-format';
 import CalculatorInput from './CalculatorInput';
 import { useNavigate } from 'react-router-dom';
-import { getScenarios, createScenario, deleteScenario } from '../api/client';
-import { Scenario, ScenarioCreate, FilingStatus } from '../types';
+import { getScenarioSummaries, createScenario, deleteScenario } from '../api/client';
+import { ScenarioSummary, ScenarioCreate, FilingStatus } from '../types';
 
 const ScenarioList: React.FC = () => {
-  const [scenarios, setScenarios] = useState<Scenario[]>([]);
+  const [scenarios, setScenarios] = useState<ScenarioSummary[]>([]);
   const [open, setOpen] = useState(false);
   const navigate = useNavigate();
   
@@ -32,7 +32,7 @@ const ScenarioList: React.FC = () => {
 
   const fetchScenarios = async () => {
     try {
-      const data = await getScenarios();
+      const data = await getScenarioSummaries();
       setScenarios(data);
     } catch (error) {
       console.error("Failed to fetch scenarios", error);
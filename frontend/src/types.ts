@@ -69,6 +69,9 @@ export interface Scenario {
   updated_at: string;
 }
 
+// Columns returned by GET /scenarios/summary for the scenario list
+export type ScenarioSummary = Pick<Scenario, 'id' | 'name' | 'current_age' | 'retirement_age' | 'created_at'>;
+
 export interface ScenarioCreate {
   name: string;
   description?: string | null;